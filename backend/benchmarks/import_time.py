@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for `python -c "import server"`.
+
+Every measurement runs in a fresh interpreter. The report has three parts:
+- Median import time over --runs, net of bare interpreter startup.
+- A breakdown by the modules server imports directly (python -X importtime)
+  and by the main steps of building the app (cProfile over the module body).
+- A check that heavy dependencies only some features need are not imported
+  eagerly.
+
+Exits non-zero on an eager heavy import, or when import time regresses
+beyond --tolerance of a baseline saved with --save.
+
+Usage (from backend/):
+    python benchmarks/import_time.py --runs 10
+    python benchmarks/import_time.py --save import_baseline.json
+    python benchmarks/import_time.py --baseline import_baseline.json --tolerance 1.3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Installed for scripts, tooling or optional backends; importing server must
+# not load them (redis is imported by the redis rate limiter when selected)
+LAZY_MODULES = (
+    "boto3", "botocore", "pandas", "numpy", "jose", "requests", "redis",
+    "typer", "passlib", "cryptography", "jq", "httpx", "multipart",
+)
+
+# Steps of the module body: label -> (file suffix, function name)
+APP_STEPS = {
+    "route registration": ("fastapi/routing.py", "add_api_route"),
+    "include_router (re-registers routes)": ("fastapi/routing.py", "include_router"),
+    "pydantic models": ("pydantic/_internal/_model_construction.py", "__new__"),
+    "FastAPI()": ("fastapi/applications.py", "__init__"),
+    "Motor client and database": ("motor/core.py", "__init__"),
+    "load_dotenv": ("dotenv/main.py", "load_dotenv"),
+}
+
+PROFILE_SCRIPT = """
+import cProfile, json, pstats, sys
+import fastapi, motor.motor_asyncio  # dependency imports are measured separately
+profile = cProfile.Profile()
+profile.enable()
+import server
+profile.disable()
+steps = json.loads(sys.argv[1])
+totals = {label: 0.0 for label in steps}
+body = 0.0
+for (filename, line, name), (_, _, _, cumulative, _) in pstats.Stats(profile).stats.items():
+    filename = filename.replace("\\\\", "/")
+    if filename.endswith("server.py") and name == "<module>":
+        body = cumulative
+    for label, (suffix, function) in steps.items():
+        if filename.endswith(suffix) and name == function:
+            totals[label] += cumulative
+print(json.dumps({"body": body, "steps": totals}))
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    # Measure with compiled bytecode cached, as a deployed image has it
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=child_env(),
+        capture_output=True, text=True, check=True
+    )
+
+
+def wall_time(code, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        python("-c", code)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def import_tree(stderr):
+    """Parse -X importtime output into {"name", "self", "cumulative", "children"} nodes."""
+    pending = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node = {
+            "name": name.strip(), "self": int(self_us), "cumulative": int(cumulative_us),
+            "children": pending.pop(level + 1, []),
+        }
+        pending.setdefault(level, []).append(node)
+    return pending.get(0, [])
+
+
+def breakdown():
+    roots = import_tree(python("-X", "importtime", "-c", "import server").stderr)
+    server = next(node for node in roots if node["name"] == "server")
+    imports = sorted(server["children"], key=lambda node: node["cumulative"], reverse=True)
+    profile = json.loads(python("-c", PROFILE_SCRIPT, json.dumps(APP_STEPS)).stdout)
+    return server, imports, profile
+
+
+def eager_lazy_modules():
+    code = f"import json, sys, server; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    return json.loads(python("-c", code).stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the backend")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="direct imports to list")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=1.3, help="allowed ratio over baseline")
+    args = parser.parse_args()
+
+    # Warm-up run writes the bytecode cache
+    python("-c", "import server")
+    interpreter = wall_time("pass", args.runs)
+    total = wall_time("import server", args.runs)
+    import_ms = (total - interpreter) * 1000
+    server, imports, profile = breakdown()
+
+    print(f"interpreter startup      {interpreter * 1000:>8.1f} ms")
+    print(f"import server (net)      {import_ms:>8.1f} ms   median of {args.runs}")
+    print()
+    print("direct imports (cumulative, -X importtime)")
+    for node in imports[:args.top]:
+        print(f"  {node['name']:<40}{node['cumulative'] / 1000:>8.1f} ms")
+    print(f"  {'server module body':<40}{server['self'] / 1000:>8.1f} ms")
+    print()
+    print("module body steps (cProfile: overlapping, includes profiler overhead)")
+    print(f"  {'total':<40}{profile['body'] * 1000:>8.1f} ms")
+    for label, seconds in profile["steps"].items():
+        print(f"  {label:<40}{seconds * 1000:>8.1f} ms")
+
+    results = {"import_ms": import_ms, "interpreter_ms": interpreter * 1000}
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+    failed = False
+    eager = eager_lazy_modules()
+    if eager:
+        print(f"\nimported eagerly, should be lazy: {', '.join(eager)}")
+        failed = True
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if import_ms > baseline["import_ms"] * args.tolerance:
+            print(f"\nREGRESSION: import takes {import_ms:.1f} ms, "
+                  f"baseline {baseline['import_ms']:.1f} ms x {args.tolerance}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+In-process load benchmark for every route in api_router and admin_router.
+
+Drives server.app through httpx's ASGI transport, so no running server is
+needed. MongoDB is an in-memory mongomock-motor stand-in unless --mongo-url
+points at a local mongod (a throwaway database is created and dropped).
+Reports p50/p95/p99 latency and requests/sec per route, and can compare
+p95 against a saved baseline to catch regressions.
+
+Usage (from backend/):
+    python benchmarks/load.py --requests 200 --concurrency 10
+    python benchmarks/load.py --save baseline.json
+    python benchmarks/load.py --baseline baseline.json --tolerance 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# The benchmark posts many contacts from a single client address
+os.environ.setdefault("RATE_LIMIT_CONTACT_BURST", "1000000000")
+os.environ.setdefault("RATE_LIMIT_CONTACT_PER_MINUTE", "1000000000")
+
+import httpx  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+
+import server  # noqa: E402
+
+
+def service_doc():
+    return {
+        "id": str(uuid.uuid4()), "title": "Bench", "description": "Bench", "icon": "Sofa",
+        "features": ["a", "b"], "active": True, "created_at": datetime.utcnow()
+    }
+
+
+def pricing_doc():
+    return {
+        "id": str(uuid.uuid4()), "category": "Bench",
+        "items": [{"name": "Item", "price": "R$ 10"}], "active": True, "created_at": datetime.utcnow()
+    }
+
+
+def testimonial_doc():
+    return {
+        "id": str(uuid.uuid4()), "name": "Bench", "location": "Bertioga", "rating": 5,
+        "text": "Bench", "active": True, "created_at": datetime.utcnow()
+    }
+
+
+def contact_doc(i=0):
+    return {
+        "id": str(uuid.uuid4()), "name": f"Lead {i}", "phone": f"1399{i:07d}",
+        "email": None, "service": "Sofás", "message": "Gostaria de um orçamento",
+        "source": ("form", "whatsapp", "phone")[i % 3],
+        "status": server.CONTACT_STATUSES[i % len(server.CONTACT_STATUSES)],
+        "created_at": datetime.utcnow() - timedelta(minutes=i)
+    }
+
+
+async def insert(collection, document):
+    await server.db[collection].insert_one(dict(document))
+    return document["id"]
+
+
+# Scenarios: (method, route path) -> async prepare(i) returning request kwargs.
+# prepare runs before timing starts, so fixture writes are not measured.
+def request(url, json_body=None, auth=True, headers=None):
+    return {"url": url, "json": json_body, "auth": auth, "headers": headers or {}}
+
+
+SCENARIOS = {
+    ("GET", "/api/"): lambda i: request("/api/", auth=False),
+    ("GET", "/api/services"): lambda i: request("/api/services", auth=False),
+    ("GET", "/api/pricing"): lambda i: request("/api/pricing", auth=False),
+    ("GET", "/api/testimonials"): lambda i: request("/api/testimonials", auth=False),
+    ("GET", "/api/company-info"): lambda i: request("/api/company-info", auth=False),
+    ("GET", "/api/site-bundle"): lambda i: request("/api/site-bundle", auth=False),
+    ("POST", "/api/contact"): lambda i: request("/api/contact", {
+        "name": "Bench", "phone": f"1398{i:07d}", "message": "Bench", "source": "form"
+    }, auth=False),
+    ("POST", "/api/admin/login"): lambda i: request(
+        "/api/admin/login", {"username": server.ADMIN_USERNAME, "password": server.ADMIN_PASSWORD}, auth=False
+    ),
+    ("POST", "/api/admin/logout"): lambda i: request("/api/admin/logout", auth=False, headers={
+        "Authorization": "Bearer " + server.create_access_token({"sub": "admin"}, timedelta(minutes=5))
+    }),
+    ("GET", "/api/admin/verify"): lambda i: request("/api/admin/verify"),
+    ("GET", "/api/admin/stats"): lambda i: request("/api/admin/stats"),
+    ("POST", "/api/admin/stats/reconcile"): lambda i: request("/api/admin/stats/reconcile"),
+    ("GET", "/api/admin/services"): lambda i: request("/api/admin/services"),
+    ("POST", "/api/admin/services"): lambda i: request("/api/admin/services", {
+        "title": "Bench", "description": "Bench", "icon": "Sofa", "features": ["a"]
+    }),
+    ("PUT", "/api/admin/services/{service_id}"): lambda i: request(
+        "/api/admin/services/1", {"description": f"Bench {i}"}
+    ),
+    ("DELETE", "/api/admin/services/{service_id}"): "services",
+    ("POST", "/api/admin/services/bulk-active"): lambda i: request(
+        "/api/admin/services/bulk-active", {"ids": ["1", "2", "3"], "active": True}
+    ),
+    ("POST", "/api/admin/services/bulk-delete"): "services:bulk",
+    ("GET", "/api/admin/pricing"): lambda i: request("/api/admin/pricing"),
+    ("POST", "/api/admin/pricing"): lambda i: request("/api/admin/pricing", {
+        "category": "Bench", "items": [{"name": "Item", "price": "R$ 10"}]
+    }),
+    ("PUT", "/api/admin/pricing/{pricing_id}"): lambda i: request(
+        "/api/admin/pricing/1", {"category": f"Sofás {i}"}
+    ),
+    ("DELETE", "/api/admin/pricing/{pricing_id}"): "pricing",
+    ("POST", "/api/admin/pricing/bulk-active"): lambda i: request(
+        "/api/admin/pricing/bulk-active", {"ids": ["1", "2", "3"], "active": True}
+    ),
+    ("POST", "/api/admin/pricing/bulk-delete"): "pricing:bulk",
+    ("GET", "/api/admin/testimonials"): lambda i: request("/api/admin/testimonials"),
+    ("POST", "/api/admin/testimonials"): lambda i: request("/api/admin/testimonials", {
+        "name": "Bench", "location": "Bertioga", "rating": 5, "text": "Bench"
+    }),
+    ("PUT", "/api/admin/testimonials/{testimonial_id}"): lambda i: request(
+        "/api/admin/testimonials/1", {"text": f"Bench {i}"}
+    ),
+    ("DELETE", "/api/admin/testimonials/{testimonial_id}"): "testimonials",
+    ("POST", "/api/admin/testimonials/bulk-active"): lambda i: request(
+        "/api/admin/testimonials/bulk-active", {"ids": ["1", "2", "3"], "active": True}
+    ),
+    ("POST", "/api/admin/testimonials/bulk-delete"): "testimonials:bulk",
+    ("GET", "/api/admin/company-info"): lambda i: request("/api/admin/company-info"),
+    ("PUT", "/api/admin/company-info"): lambda i: request("/api/admin/company-info", {}),
+    ("GET", "/api/admin/slow-queries"): lambda i: request("/api/admin/slow-queries"),
+    ("DELETE", "/api/admin/slow-queries"): lambda i: request("/api/admin/slow-queries"),
+    ("GET", "/api/admin/contacts"): lambda i: request("/api/admin/contacts?limit=50"),
+    ("PUT", "/api/admin/contacts/{contact_id}/status"): "contacts:status",
+    ("DELETE", "/api/admin/contacts/{contact_id}"): "contacts",
+    ("POST", "/api/admin/contacts/bulk-status"): "contacts:bulk-status",
+    ("POST", "/api/admin/contacts/bulk-delete"): "contacts:bulk",
+}
+
+# Routes that cannot be measured as request/response round trips
+SKIPPED = {
+    ("GET", "/api/admin/contacts/stream"): "long-lived event stream",
+    ("POST", "/api/admin/logout-all"): "revokes the benchmark's own token",
+}
+
+# Items per bulk request
+BULK_SIZE = 20
+
+FIXTURES = {
+    "services": service_doc,
+    "pricing": pricing_doc,
+    "testimonials": testimonial_doc,
+    "contacts": contact_doc,
+}
+
+
+async def prepare(method, path, i):
+    scenario = SCENARIOS[(method, path)]
+    if callable(scenario):
+        return scenario(i)
+    collection, _, action = scenario.partition(":")
+    if action.startswith("bulk"):
+        ids = [await insert(collection, FIXTURES[collection]()) for _ in range(BULK_SIZE)]
+        body = {"ids": ids, "status": "closed"} if action == "bulk-status" else {"ids": ids}
+        return request(path, body)
+    document_id = await insert(collection, FIXTURES[collection]())
+    url = re.sub(r"\{[^}]+\}", document_id, path)
+    if action == "status":
+        return request(url, {"status": "contacted"})
+    return request(url)
+
+
+def app_routes():
+    for router in (server.api_router, server.admin_router):
+        for route in router.routes:
+            if isinstance(route, APIRoute):
+                for method in sorted(route.methods):
+                    yield method, route.path
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(client, token, method, path, requests, concurrency):
+    prepared = [await prepare(method, path, i) for i in range(requests)]
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for item in prepared:
+        queue.put_nowait(item)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            headers = dict(item["headers"])
+            if item["auth"]:
+                headers["Authorization"] = f"Bearer {token}"
+            started = time.perf_counter()
+            response = await client.request(method, item["url"], json=item["json"], headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            # In-process requests that never block (cache hits on the
+            # in-memory database) would otherwise keep this worker running
+            # and starve the others, as real socket I/O never does
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+async def setup_database(mongo_url):
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        server.client = AsyncIOMotorClient(mongo_url)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is not installed; install it or pass --mongo-url")
+        server.client = AsyncMongoMockClient()
+    name = f"bench_{uuid.uuid4().hex[:8]}"
+    server.db = server.client[name]
+    return name
+
+
+async def run(args):
+    db_name = await setup_database(args.mongo_url)
+    await server.startup_event()
+    await server.seed_database()
+    await server.db.contacts.insert_many([contact_doc(i) for i in range(args.contacts)])
+    await server.reconcile_contact_counters()
+
+    pattern = re.compile(args.routes) if args.routes else None
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = server.create_access_token({"sub": server.ADMIN_USERNAME}, timedelta(hours=1))
+            for method, path in app_routes():
+                name = f"{method} {path}"
+                if pattern and not pattern.search(name):
+                    continue
+                if (method, path) in SKIPPED:
+                    print(f"skipped {name}: {SKIPPED[(method, path)]}")
+                    continue
+                if (method, path) not in SCENARIOS:
+                    print(f"skipped {name}: no scenario defined")
+                    continue
+                results[name] = await measure(client, token, method, path, args.requests, args.concurrency)
+    finally:
+        if args.mongo_url:
+            await server.client.drop_database(db_name)
+        await server.shutdown_db_client()
+    return results
+
+
+def report(results, baseline, tolerance):
+    header = f"{'route':<48}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    regressions = []
+    for name, result in results.items():
+        line = (f"{name:<48}{result['rps']:>9.0f}{result['p50_ms']:>9.2f}"
+                f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['errors']:>8}")
+        previous = baseline.get(name)
+        if previous and result["p95_ms"] > previous["p95_ms"] * tolerance:
+            regressions.append(name)
+            line += f"  REGRESSION (baseline p95 {previous['p95_ms']:.2f} ms)"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load benchmark for the API routes")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent in-flight requests")
+    parser.add_argument("--contacts", type=int, default=1000, help="contacts seeded before the run")
+    parser.add_argument("--routes", help="regex selecting routes, e.g. '^GET /api/(services|pricing)'")
+    parser.add_argument("--mongo-url", help="use a local mongod instead of the in-memory stand-in")
+    parser.add_argument("--save", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare p95 against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed p95 ratio over baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else {}
+    regressions = report(results, baseline, args.tolerance)
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    failed = [name for name, result in results.items() if result["errors"]]
+    if failed:
+        print(f"\n{len(failed)} route(s) returned errors: {', '.join(failed)}")
+    if regressions:
+        print(f"\n{len(regressions)} route(s) regressed beyond {args.tolerance}x baseline p95")
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
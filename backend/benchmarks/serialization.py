@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the public catalog payloads.
+
+Compares, on the seeded data, the stdlib path (jsonable_encoder + json),
+orjson, and a catalog cache hit: ``server.catalog_response`` building the
+response from the cached payloads and the rendered body kept for the route,
+for a browser that accepts compression.
+
+Usage (from backend/): python benchmarks/serialization.py [--number 2000]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+import server  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def stdlib_dumps(content) -> bytes:
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def payloads() -> dict:
+    seed = server.seed_documents()
+    bundle = {
+        "services": seed["services"],
+        "pricing": seed["pricing"],
+        "testimonials": seed["testimonials"],
+        "company": seed["company_info"],
+    }
+    return {
+        "services": {"services": seed["services"]},
+        "pricing": {"pricing": seed["pricing"]},
+        "testimonials": {"testimonials": seed["testimonials"]},
+        "company-info": {"company": seed["company_info"]},
+        "site-bundle": bundle,
+    }
+
+
+def browser_request(route: str) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": f"/api/{route}",
+        "headers": [(b"accept-encoding", b"gzip, deflate, br")],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="encodes per measurement")
+    args = parser.parse_args()
+
+    encoders = {"stdlib": stdlib_dumps}
+    if orjson is not None:
+        encoders["orjson"] = orjson.dumps
+    else:
+        print("orjson not installed, skipping it")
+
+    header = f"{'payload':<14}{'bytes':>8}" + "".join(f"{name + ' µs':>14}" for name in encoders) + f"{'cached µs':>14}"
+    print(header)
+    print("-" * len(header))
+    for route, content in payloads().items():
+        size = len(stdlib_dumps(content))
+        row = f"{route:<14}{size:>8}"
+        for encode in encoders.values():
+            seconds = min(timeit.repeat(lambda: encode(content), number=args.number, repeat=5))
+            row += f"{seconds / args.number * 1e6:>14.2f}"
+        # Cache hit: the payloads are the cached ones and the route's
+        # rendered body (and its compressed variant) is warm after one call
+        parts = {name: server.CachedPayload(value) for name, value in content.items()}
+        request = browser_request(route)
+        server.catalog_response(request, route, parts)
+        seconds = min(timeit.repeat(
+            lambda: server.catalog_response(request, route, parts), number=args.number, repeat=5
+        ))
+        row += f"{seconds / args.number * 1e6:>14.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Management commands for the TM Higienização backend.
+
+Setup that depends on the size or state of the data runs here instead of
+at server startup. Every command is safe to run repeatedly.
+
+Usage (from backend/):
+    python manage.py seed                 # ensure-indexes, then default catalog into empty collections
+    python manage.py ensure-indexes       # create missing indexes, report drift
+    python manage.py reconcile-counters   # rebuild contact counters
+    python manage.py check                # exit 1 if anything above is pending
+    python manage.py revoke-tokens        # log out every admin session (after a password change)
+    python manage.py init                 # ensure-indexes, seed, reconcile-counters
+"""
+
+import asyncio
+
+import typer
+
+import server
+
+cli = typer.Typer(help="TM Higienização management commands.", no_args_is_help=True)
+
+
+def run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            server.client.close()
+
+    return asyncio.run(main())
+
+
+async def indexes_and_report():
+    drift = await server.ensure_indexes()
+    for message in drift:
+        typer.echo(f"drift: {message}")
+    typer.echo("indexes: ok" if not drift else f"indexes: {len(drift)} drift warning(s)")
+
+
+async def seed_and_report():
+    # The unique indexes are what keep concurrent seeds from inserting twice
+    await indexes_and_report()
+    counts = await server.seed_database()
+    for name, inserted in counts.items():
+        typer.echo(f"{name}: {f'inserted {inserted}' if inserted else 'already seeded'}")
+
+
+async def reconcile_and_report():
+    totals = await server.reconcile_contact_counters()
+    typer.echo(f"contact counters: {totals['total']} contacts")
+
+
+@cli.command()
+def seed():
+    """Create missing indexes, then insert the default catalog into empty collections."""
+    run(seed_and_report())
+
+
+@cli.command("ensure-indexes")
+def ensure_indexes():
+    """Create missing indexes and report definitions that differ."""
+    run(indexes_and_report())
+
+
+@cli.command("reconcile-counters")
+def reconcile_counters():
+    """Rebuild the contact counters from the contacts collection."""
+    run(reconcile_and_report())
+
+
+@cli.command()
+def check():
+    """Report pending setup; exits 1 if there is any."""
+    problems = run(server.check_database())
+    for problem in problems:
+        typer.echo(problem)
+    if problems:
+        raise typer.Exit(code=1)
+    typer.echo("database: ok")
+
+
+@cli.command("revoke-tokens")
+def revoke_tokens():
+    """Reject every admin token issued until now, in all workers."""
+    run(server.revoke_all_tokens())
+    typer.echo("tokens: all revoked")
+
+
+@cli.command()
+def init():
+    """Run ensure-indexes, seed and reconcile-counters."""
+
+    async def steps():
+        await seed_and_report()
+        await reconcile_and_report()
+
+    run(steps())
+
+
+if __name__ == "__main__":
+    cli()
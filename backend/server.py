@@ -1,38 +1,444 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, DeleteOne, IndexModel, ReplaceOne, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, OperationFailure, PyMongoError
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
-from datetime import datetime, timedelta
+import re
+import json
+import base64
+import gzip
+from datetime import datetime, timedelta, timezone
+import time
+import itertools
+import threading
+from collections import OrderedDict
 import jwt
 import hashlib
 from bson import ObjectId
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms rendered in the
+    Prometheus text exposition format."""
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, name: str, kind: str, help_text: str, labelnames: tuple, buckets: tuple = None):
+        self._metrics[name] = {
+            "kind": kind, "help": help_text, "labelnames": labelnames,
+            "buckets": buckets or self.DEFAULT_BUCKETS, "series": {}
+        }
+
+    def inc(self, name: str, labels: tuple, amount: float = 1.0):
+        series = self._metrics[name]["series"]
+        with self._lock:
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def observe(self, name: str, labels: tuple, value: float):
+        metric = self._metrics[name]
+        with self._lock:
+            counts = metric["series"].get(labels)
+            if counts is None:
+                # one slot per bucket, then sum and count
+                counts = metric["series"][labels] = [0] * (len(metric["buckets"]) + 2)
+            for i, bound in enumerate(metric["buckets"]):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    @staticmethod
+    def _labels(names: tuple, values: tuple, le: str = None) -> str:
+        pairs = [(name, str(value)) for name, value in zip(names, values)]
+        if le is not None:
+            pairs.append(("le", le))
+        if not pairs:
+            return ""
+        escaped = (
+            (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in pairs
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['kind']}")
+                names = metric["labelnames"]
+                for values, data in metric["series"].items():
+                    if metric["kind"] != "histogram":
+                        lines.append(f"{name}{self._labels(names, values)} {data}")
+                        continue
+                    for bound, count in zip(metric["buckets"], data):
+                        lines.append(f"{name}_bucket{self._labels(names, values, str(bound))} {count}")
+                    lines.append(f"{name}_bucket{self._labels(names, values, '+Inf')} {data[-1]}")
+                    lines.append(f"{name}_sum{self._labels(names, values)} {data[-2]}")
+                    lines.append(f"{name}_count{self._labels(names, values)} {data[-1]}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+metrics.register("http_requests_total", "counter", "HTTP requests by route and status.", ("method", "route", "status"))
+metrics.register("http_request_duration_seconds", "histogram", "HTTP request latency.", ("method", "route"))
+metrics.register("http_response_size_bytes", "histogram", "HTTP response body size.", ("method", "route"),
+                 buckets=(100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000))
+metrics.register("http_requests_in_progress", "gauge", "HTTP requests being served.", ("method",))
+metrics.register("mongodb_command_duration_seconds", "histogram", "MongoDB command latency by collection.",
+                 ("collection", "command"))
+metrics.register("mongodb_command_failures_total", "counter", "Failed MongoDB commands by collection.",
+                 ("collection", "command"))
+metrics.register("mongodb_pool_connections", "gauge", "MongoDB pool connections by state (open, in_use, waiting).",
+                 ("server", "state"))
+metrics.register("mongodb_pool_checkout_failures_total", "counter", "Failed MongoDB connection check-outs.",
+                 ("server", "reason"))
+metrics.register("catalog_cache_requests_total", "counter",
+                 "Catalog cache lookups by key and result (hit, miss, coalesced, refresh).", ("key", "result"))
+metrics.register("circuit_breaker_state", "gauge",
+                 "Circuit breaker state (closed, open, half_open); 1 marks the current one.", ("breaker", "state"))
+metrics.register("catalog_fallback_total", "counter",
+                 "Catalog loads answered from the last good snapshot, by key and reason (open, timeout, error).",
+                 ("key", "reason"))
+
+def command_collection(command_name: str, command) -> str:
+    if command_name == "getMore":
+        return command.get("collection", "")
+    value = command.get(command_name)
+    return value if isinstance(value, str) else ""
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Times every MongoDB command per collection (runs on driver threads)."""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        self._collections[event.request_id] = command_collection(event.command_name, event.command)
+
+    def succeeded(self, event):
+        collection = self._collections.pop(event.request_id, "")
+        metrics.observe("mongodb_command_duration_seconds", (collection, event.command_name),
+                        event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._collections.pop(event.request_id, "")
+        metrics.observe("mongodb_command_duration_seconds", (collection, event.command_name),
+                        event.duration_micros / 1e6)
+        metrics.inc("mongodb_command_failures_total", (collection, event.command_name))
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool occupancy per server for /readyz and /metrics (runs on driver threads)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {server: dict(pool) for server, pool in self._pools.items()}
+
+    def _update(self, address, **deltas):
+        server = f"{address[0]}:{address[1]}"
+        with self._lock:
+            pool = self._pools.setdefault(server, {"open": 0, "in_use": 0, "waiting": 0})
+            for state, delta in deltas.items():
+                pool[state] += delta
+        for state, delta in deltas.items():
+            metrics.inc("mongodb_pool_connections", (server, state), delta)
+
+    def connection_created(self, event):
+        self._update(event.address, open=1)
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_checked_out(self, event):
+        self._update(event.address, waiting=-1, in_use=1)
+
+    def connection_check_out_failed(self, event):
+        self._update(event.address, waiting=-1)
+        metrics.inc("mongodb_pool_checkout_failures_total", (f"{event.address[0]}:{event.address[1]}", event.reason))
+
+    def connection_checked_in(self, event):
+        self._update(event.address, in_use=-1)
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+pool_stats = PoolStatsListener()
+
+# Slow query monitoring
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_TOP_N = int(os.environ.get('SLOW_QUERY_TOP_N', '20'))
+
+# Where each command keeps the part that decides index usage
+COMMAND_FILTER_PATHS = {
+    "find": ("filter",),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query",),
+    "update": ("updates", 0, "q"),
+    "delete": ("deletes", 0, "q"),
+    "aggregate": ("pipeline",),
+}
+
+def query_shape(value):
+    """Replace literal values with "?" and keep field names and operators."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+def command_filter(command_name: str, command):
+    value = command
+    for step in COMMAND_FILTER_PATHS.get(command_name, ()):
+        try:
+            value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value if COMMAND_FILTER_PATHS.get(command_name) else None
+
+class SlowQueryMonitor(monitoring.CommandListener):
+    """Logs commands slower than the threshold and keeps per-shape stats.
+
+    Shapes are held in a bounded LRU so the table cannot grow without
+    limit; ``top`` ranks them by their slowest observed run.
+    """
+
+    def __init__(self, threshold_ms: float, max_shapes: int = 500):
+        self.threshold_ms = threshold_ms
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._shapes = OrderedDict()
+
+    def started(self, event):
+        self._pending[event.request_id] = event.command
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        command = self._pending.pop(event.request_id, None)
+        duration_ms = event.duration_micros / 1000
+        if command is None or duration_ms < self.threshold_ms:
+            return
+        collection = command_collection(event.command_name, command)
+        filter_doc = command_filter(event.command_name, command)
+        shape = json.dumps(query_shape(filter_doc) if filter_doc is not None else None, sort_keys=True)
+        logger.warning(f"Slow query: {collection}.{event.command_name} {shape} took {duration_ms:.1f} ms")
+        key = (collection, event.command_name, shape)
+        with self._lock:
+            stats = self._shapes.pop(key, None) or {
+                "collection": collection, "command": event.command_name, "shape": shape,
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0
+            }
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["last_seen"] = datetime.utcnow()
+            self._shapes[key] = stats
+            while len(self._shapes) > self.max_shapes:
+                self._shapes.popitem(last=False)
+
+    def top(self, limit: int) -> List[dict]:
+        with self._lock:
+            ranked = sorted(self._shapes.values(), key=lambda stats: stats["max_ms"], reverse=True)[:limit]
+            return [{**stats, "avg_ms": stats["total_ms"] / stats["count"]} for stats in ranked]
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+
+slow_query_monitor = SlowQueryMonitor(SLOW_QUERY_THRESHOLD_MS)
+
 # MongoDB connection
+# Connection pool and timeouts (milliseconds); 0 keeps the driver default,
+# which for the wait queue and sockets means waiting indefinitely
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    "waitQueueTimeoutMS": int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000')),
+    "serverSelectionTimeoutMS": int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+    "connectTimeoutMS": int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+    "socketTimeoutMS": int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '30000')),
+}
+# Seconds /readyz waits for a ping
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', '2'))
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[CommandMetricsListener(), slow_query_monitor, pool_stats],
+    **{option: value for option, value in MONGO_CLIENT_OPTIONS.items() if value or option == "minPoolSize"}
+)
 db = client[os.environ['DB_NAME']]
 
+# JSON serialization: "orjson" (used when installed) or "json" (stdlib)
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'orjson')
+USE_ORJSON = JSON_ENCODER == "orjson" and orjson is not None
+
+def json_dumps(content) -> bytes:
+    if USE_ORJSON:
+        return orjson.dumps(content)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
 # Create the main app without a prefix
-app = FastAPI(title="TM Higienização API", version="1.0.0")
+app = FastAPI(
+    title="TM Higienização API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if USE_ORJSON else JSONResponse
+)
 
 # Create routers
 api_router = APIRouter(prefix="/api")
 admin_router = APIRouter(prefix="/api/admin")
 
+# HTTP caching for public GET routes (seconds)
+PUBLIC_CACHE_MAX_AGE = int(os.environ.get('PUBLIC_CACHE_MAX_AGE', '60'))
+PUBLIC_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('PUBLIC_CACHE_STALE_WHILE_REVALIDATE', '600'))
+
+# Per-route Cache-Control overrides, e.g. CACHE_CONTROL_PRICING="public, max-age=300"
+PUBLIC_CACHE_CONTROL = {
+    route: os.environ.get(f'CACHE_CONTROL_{route.upper().replace("-", "_")}')
+    for route in ("root", "services", "pricing", "testimonials", "company-info", "site-bundle")
+}
+
+# Response compression: bodies below the minimum size are sent as-is
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '500'))
+COMPRESSION_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Rate limits for anonymous write routes: token buckets of `capacity`
+# requests refilled at `per_minute`, applied per client IP and per phone
+RATE_LIMITS = {
+    "contact": {
+        "capacity": int(os.environ.get('RATE_LIMIT_CONTACT_BURST', '5')),
+        "per_minute": float(os.environ.get('RATE_LIMIT_CONTACT_PER_MINUTE', '10')),
+    },
+}
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # 'memory' or 'redis'
+RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+# Reverse proxies in front of the app that append to X-Forwarded-For. The
+# client IP is the entry the outermost trusted proxy appended, N from the
+# right; entries further left are sent by the client and can be forged.
+# IMPORTANT: behind a proxy or ingress this must be set, or every visitor
+# shares the proxy's IP and the per-IP limit becomes one site-wide limit.
+# TRUST_PROXY_HEADERS=true is the older spelling of one hop.
+TRUSTED_PROXY_HOPS = int(os.environ.get(
+    'TRUSTED_PROXY_HOPS',
+    '1' if os.environ.get('TRUST_PROXY_HEADERS', 'false').lower() == 'true' else '0'
+))
+
 # JWT Configuration
 SECRET_KEY = "tm_higienizacao_secret_key_2024"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 hours
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '1024'))
+# Revocations are stored in MongoDB; every worker polls for new ones this
+# often (seconds), so a logout takes effect everywhere within the interval
+TOKEN_REVOCATION_POLL_INTERVAL = float(os.environ.get('TOKEN_REVOCATION_POLL_INTERVAL', '1'))
+
+# Catalog cache configuration (seconds, 0 disables caching)
+CATALOG_CACHE_TTL = float(os.environ.get('CATALOG_CACHE_TTL', '300'))
+# Reload an entry in the background when a hit finds it this close to
+# expiry (seconds, 0 disables refresh-ahead)
+CATALOG_CACHE_REFRESH_AHEAD = float(os.environ.get('CATALOG_CACHE_REFRESH_AHEAD', '0'))
+
+# Circuit breaker for catalog reads: reads slower than the timeout count as
+# failures (seconds, 0 waits indefinitely), and after this many consecutive
+# failures reads are skipped for the reset timeout. Meanwhile the public
+# routes serve the last catalog read successfully.
+CATALOG_READ_TIMEOUT = float(os.environ.get('CATALOG_READ_TIMEOUT', '2'))
+CATALOG_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('CATALOG_BREAKER_FAILURE_THRESHOLD', '5'))
+CATALOG_BREAKER_RESET_TIMEOUT = float(os.environ.get('CATALOG_BREAKER_RESET_TIMEOUT', '30'))
+# JSON file that also keeps that last good catalog, so a process restarted
+# during an outage can serve it (empty keeps it in memory only)
+CATALOG_SNAPSHOT_PATH = os.environ.get('CATALOG_SNAPSHOT_PATH', '')
+
+# Cross-process catalog invalidation: "auto" watches a change stream on a
+# replica set or sharded cluster and polls version counters on a standalone
+# mongod; "changestream", "poll" and "off" force one behaviour
+CATALOG_SYNC_MODE = os.environ.get('CATALOG_SYNC_MODE', 'auto')
+CATALOG_SYNC_POLL_INTERVAL = float(os.environ.get('CATALOG_SYNC_POLL_INTERVAL', '2'))
+
+# Delta sync: tombstones of deleted records are kept this many days, and
+# server_time is moved back by the overlap so writes still in flight when
+# a delta is read are sent again on the next sync
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+DELTA_SYNC_OVERLAP_SECONDS = float(os.environ.get('DELTA_SYNC_OVERLAP_SECONDS', '5'))
+
+# Contact write mode: "direct" awaits insert_one per request, "buffered"
+# acknowledges immediately and batches inserts (queued contacts are lost
+# if the process dies before a flush)
+CONTACT_WRITE_MODE = os.environ.get('CONTACT_WRITE_MODE', 'direct')
+CONTACT_QUEUE_MAX_SIZE = int(os.environ.get('CONTACT_QUEUE_MAX_SIZE', '10000'))
+CONTACT_BATCH_SIZE = int(os.environ.get('CONTACT_BATCH_SIZE', '100'))
+CONTACT_FLUSH_INTERVAL = float(os.environ.get('CONTACT_FLUSH_INTERVAL', '0.5'))
+
+# Live contact events (Server-Sent Events) for the admin panel
+CONTACT_EVENTS_QUEUE_SIZE = int(os.environ.get('CONTACT_EVENTS_QUEUE_SIZE', '1000'))
+CONTACT_EVENTS_HEARTBEAT = float(os.environ.get('CONTACT_EVENTS_HEARTBEAT', '15'))
+# EventSource cannot send headers, so browsers open the stream with a
+# ticket in the query string: a JWT valid for this many seconds that only
+# opens event streams, instead of the admin token itself
+STREAM_TICKET_TTL = int(os.environ.get('STREAM_TICKET_TTL', '30'))
+STREAM_TICKET_SCOPE = "contacts-stream"
 
 # Security
 security = HTTPBearer()
@@ -55,6 +461,7 @@ class Service(BaseModel):
     features: List[str]
     active: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ServiceCreate(BaseModel):
     title: str
@@ -76,6 +483,7 @@ class PricingCategory(BaseModel):
     items: List[PricingItem]
     active: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class PricingCategoryCreate(BaseModel):
     category: str
@@ -95,6 +503,7 @@ class Testimonial(BaseModel):
     text: str
     active: bool = True
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class TestimonialCreate(BaseModel):
     name: str
@@ -120,6 +529,7 @@ class Contact(BaseModel):
     source: str = "form"  # 'whatsapp', 'form', 'phone'
     status: str = "pending"  # 'pending', 'contacted', 'converted', 'closed'
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ContactCreate(BaseModel):
     name: str
@@ -132,6 +542,20 @@ class ContactCreate(BaseModel):
 class ContactStatusUpdate(BaseModel):
     status: str
 
+BULK_MAX_ITEMS = 1000
+
+class BulkIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkActiveUpdate(BulkIds):
+    active: bool
+
+class BulkStatusUpdate(BulkIds):
+    status: str
+
+CONTACT_STATUSES = ["pending", "contacted", "converted", "closed"]
+CONTACT_SOURCES = ["whatsapp", "form", "phone"]
+
 class CompanyInfo(BaseModel):
     name: str = "TM Higienização"
     location: str = "Bertioga - São Paulo"
@@ -150,27 +574,88 @@ class Token(BaseModel):
     token_type: str
 
 # Helper functions
+class TokenCache:
+    """LRU cache of verified tokens, keyed by SHA-256 of the token.
+
+    Entries expire with the token's own ``exp``. ``revoke`` blocks a single
+    token until it expires and ``revoke_all`` rejects every token issued in
+    or before the second ``valid_after`` (``iat`` has whole seconds);
+    ``TokenRevocationSync`` applies the revocations other workers made.
+    Only used from the event loop, so it takes no lock.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.valid_after = None
+        self._entries = OrderedDict()
+        self._revoked = {}
+
+    def get(self, digest: str) -> Optional[str]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        username, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return username
+
+    def put(self, digest: str, username: str, expires_at: float):
+        self._entries[digest] = (username, expires_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def is_revoked(self, digest: str, issued_at: float) -> bool:
+        return digest in self._revoked or (self.valid_after is not None and issued_at <= self.valid_after)
+
+    def revoke(self, digest: str, expires_at: float):
+        self._entries.pop(digest, None)
+        now = time.time()
+        self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+        self._revoked[digest] = expires_at
+
+    def revoke_all(self, valid_after: int):
+        if self.valid_after is not None and valid_after <= self.valid_after:
+            return
+        self.valid_after = valid_after
+        self._entries.clear()
+        # Tokens revoked one by one may have been issued after valid_after
+        now = time.time()
+        self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": str(uuid.uuid4())})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def validate_token(token: str) -> str:
+    digest = token_digest(token)
+    username = token_cache.get(digest)
+    if username is not None:
+        return username
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        # Scoped tokens (stream tickets) are not admin tokens
+        if username is None or "scope" in payload or token_cache.is_revoked(digest, payload.get("iat", 0)):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        token_cache.put(digest, username, payload["exp"])
         return username
     except jwt.PyJWTError:
         raise HTTPException(
@@ -179,236 +664,1561 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+# Async so FastAPI runs them on the event loop: no threadpool hop per
+# admin request, and the token cache is never touched from two threads
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return validate_token(credentials.credentials)
+
+def token_session(token: str) -> dict:
+    # The admin token a stream belongs to, as far as revocation needs it
+    validate_token(token)
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return {"sub": payload["sub"], "sid": token_digest(token), "iat": payload.get("iat", 0), "exp": payload["exp"]}
+
+def session_active(session: dict) -> bool:
+    return session["exp"] > time.time() and not token_cache.is_revoked(session["sid"], session["iat"])
+
+def create_stream_ticket(session: dict) -> str:
+    return jwt.encode({
+        "sub": session["sub"],
+        "scope": STREAM_TICKET_SCOPE,
+        "sid": session["sid"], "sid_iat": session["iat"], "sid_exp": session["exp"],
+        "exp": datetime.utcnow() + timedelta(seconds=STREAM_TICKET_TTL),
+    }, SECRET_KEY, algorithm=ALGORITHM)
+
+async def verify_stream_token(request: Request, ticket: Optional[str] = None) -> dict:
+    # Accepts the admin token in the Authorization header or a stream
+    # ticket in the query string. Returns the session for re-validation.
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return token_session(credentials)
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if not ticket:
+        raise unauthorized
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        raise unauthorized
+    if payload.get("scope") != STREAM_TICKET_SCOPE:
+        raise unauthorized
+    session = {"sub": payload["sub"], "sid": payload["sid"], "iat": payload["sid_iat"], "exp": payload["sid_exp"]}
+    if not session_active(session):
+        raise unauthorized
+    return session
+
+async def revoke_token(token: str):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return
+    digest = token_digest(token)
+    token_cache.revoke(digest, payload["exp"])
+    try:
+        await db.token_revocations.update_one(
+            {"_id": digest},
+            {"$set": {"expires_at": datetime.utcfromtimestamp(payload["exp"]), "revoked_at": datetime.utcnow()}},
+            upsert=True
+        )
+    except PyMongoError as e:
+        logger.error(f"Error storing token revocation, other workers still accept it: {e}")
+
+async def revoke_all_tokens():
+    # Call when the admin password changes (python manage.py revoke-tokens)
+    # Tokens issued earlier in this second are rejected too (iat has whole
+    # seconds), at the cost of ones issued just after in the same second
+    valid_after = int(time.time())
+    token_cache.revoke_all(valid_after)
+    await db.token_revocations.update_one(
+        {"_id": "all"},
+        {"$max": {"valid_after": valid_after}, "$set": {"revoked_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+class TokenRevocationSync:
+    """Applies revocations stored in ``token_revocations`` to ``token_cache``.
+
+    ``refresh`` reads the ones recorded since the previous read (all of
+    them the first time); ``start`` repeats it every ``poll_interval``.
+    """
+
+    # Re-read a little before the last one seen, for clock skew between workers
+    OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._since = None
+        self._task = None
+
+    async def refresh(self):
+        query = {} if self._since is None else {"revoked_at": {"$gte": self._since - self.OVERLAP}}
+        async for document in db.token_revocations.find(query):
+            if document["_id"] == "all":
+                token_cache.revoke_all(document["valid_after"])
+            elif "expires_at" in document:
+                token_cache.revoke(document["_id"], document["expires_at"].replace(tzinfo=timezone.utc).timestamp())
+            if self._since is None or document["revoked_at"] > self._since:
+                self._since = document["revoked_at"]
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except PyMongoError as e:
+                logger.warning(f"Error polling token revocations: {e}")
+
+token_revocation_sync = TokenRevocationSync(TOKEN_REVOCATION_POLL_INTERVAL)
+
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
-# Initialize database with mock data
-async def init_database():
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    for coding in COMPRESSION_ENCODINGS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+
+class CompressionMiddleware:
+    """Compress buffered responses with brotli or gzip, as negotiated.
+
+    Responses that already carry Content-Encoding (such as precompressed
+    catalog payloads), event streams, chunked bodies and bodies below
+    ``minimum_size`` pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 500):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending_start = None
+
+        async def send_compressed(message):
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get("content-type", "").startswith("text/event-stream"):
+                    await send(message)
+                else:
+                    pending_start = message
+                return
+            if pending_start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            start, pending_start = pending_start, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+            body = compress(body, encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = variant_etag(headers["etag"], encoding)
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+class MetricsMiddleware:
+    """Record request counts, latency, response size and in-flight requests.
+
+    Routes are labelled with their path template so ids in URLs do not
+    create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_measured(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.inc("http_requests_in_progress", (method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.inc("http_requests_in_progress", (method,), -1)
+            metrics.inc("http_requests_total", (method, route_path, str(status_code)))
+            metrics.observe("http_request_duration_seconds", (method, route_path), time.perf_counter() - started)
+            metrics.observe("http_response_size_bytes", (method, route_path), size)
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    # Each content-coding is a distinct representation with its own tag
+    if encoding is None or etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def json_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+class RenderedBody:
+    """Serialized JSON body with its ETag and lazily compressed variants."""
+
+    __slots__ = ("body", "etag", "best", "_encoded")
+
+    def __init__(self, body: bytes, best: bool = False):
+        self.body = body
+        self.etag = json_etag(body)
+        self.best = best
+        self._encoded = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding, best=self.best)
+        return self._encoded[encoding]
+
+def conditional_response(request: Request, route: str, rendered: RenderedBody) -> Response:
+    """JSON response with a strong content-hash ETag and Cache-Control.
+
+    Returns an empty 304 when the client already holds the current
+    representation, and the compressed variant the client accepts.
+    """
+    encoding = None
+    if len(rendered.body) >= COMPRESSION_MINIMUM_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    etag = variant_etag(rendered.etag, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": PUBLIC_CACHE_CONTROL.get(route) or (
+            f"public, max-age={PUBLIC_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={PUBLIC_CACHE_STALE_WHILE_REVALIDATE}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is None:
+        return Response(content=rendered.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=rendered.encoded(encoding), media_type="application/json", headers=headers)
+
+def cacheable_response(request: Request, route: str, content) -> Response:
+    return conditional_response(request, route, RenderedBody(json_dumps(content)))
+
+_rendered_catalog = {}
+
+def catalog_response(request: Request, route: str, parts: dict) -> Response:
+    """Serve a JSON object whose members are cached catalog payloads.
+
+    The body is spliced from the payloads' pre-serialized bytes and kept,
+    along with its compressed variants, until one of them is replaced, so
+    cache hits skip encoding, hashing and compression.
+    """
+    payloads = tuple(parts.values())
+    entry = _rendered_catalog.get(route)
+    if entry is None or len(entry[0]) != len(payloads) or any(
+        cached is not payload for cached, payload in zip(entry[0], payloads)
+    ):
+        body = b"{" + b",".join(
+            json_dumps(name) + b":" + payload.json for name, payload in parts.items()
+        ) + b"}"
+        entry = (payloads, RenderedBody(body, best=True))
+        _rendered_catalog[route] = entry
+    return conditional_response(request, route, entry[1])
+
+def encode_contacts_cursor(contact: dict) -> str:
+    payload = json.dumps([contact["created_at"].isoformat(), contact["id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_contacts_cursor(cursor: str):
     try:
-        # Check if data already exists
-        services_count = await db.services.count_documents({})
-        if services_count == 0:
-            # Insert mock services
-            mock_services = [
-                {
-                    "id": "1",
-                    "title": "Sofás e Poltronas",
-                    "description": "Higienização profunda com produtos específicos para cada tipo de tecido",
-                    "icon": "Sofa",
-                    "features": ["Remoção de manchas", "Eliminação de odores", "Proteção anti-ácaros"],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "2",
-                    "title": "Colchões e Travesseiros",
-                    "description": "Limpeza especializada para um sono mais saudável",
-                    "icon": "Bed",
-                    "features": ["Aspiração profunda", "Sanitização completa", "Secagem rápida"],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "3",
-                    "title": "Tapetes e Carpetes",
-                    "description": "Restauração da beleza original dos seus tapetes",
-                    "icon": "Home",
-                    "features": ["Lavagem com shampoo", "Remoção de pelos", "Impermeabilização"],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "4",
-                    "title": "Bancos Automotivos",
-                    "description": "Cuidado especial para o interior do seu veículo",
-                    "icon": "Car",
-                    "features": ["Limpeza de couro", "Tecidos automotivos", "Proteção UV"],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "5",
-                    "title": "Cortinas",
-                    "description": "Higienização sem retirar de casa",
-                    "icon": "Sun",
-                    "features": ["Limpeza no local", "Todos os tecidos", "Secagem natural"],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                }
-            ]
-            await db.services.insert_many(mock_services)
-            
-            # Insert mock pricing
-            mock_pricing = [
-                {
-                    "id": "1",
-                    "category": "Sofás",
-                    "items": [
-                        {"name": "Sofá 2 lugares - Tecido comum", "price": "R$ 80"},
-                        {"name": "Sofá 2 lugares - Couro/Suede", "price": "R$ 100"},
-                        {"name": "Sofá 3 lugares - Tecido comum", "price": "R$ 120"},
-                        {"name": "Sofá 3 lugares - Couro/Suede", "price": "R$ 150"},
-                        {"name": "Sofá de canto - Tecido comum", "price": "R$ 180"},
-                        {"name": "Sofá de canto - Couro/Suede", "price": "R$ 220"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "2",
-                    "category": "Poltronas e Cadeiras",
-                    "items": [
-                        {"name": "Poltrona - Tecido comum", "price": "R$ 50"},
-                        {"name": "Poltrona - Couro/Suede", "price": "R$ 70"},
-                        {"name": "Cadeira estofada", "price": "R$ 30"},
-                        {"name": "Cadeira de couro", "price": "R$ 40"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "3",
-                    "category": "Colchões",
-                    "items": [
-                        {"name": "Colchão Solteiro", "price": "R$ 60"},
-                        {"name": "Colchão Casal", "price": "R$ 80"},
-                        {"name": "Colchão Queen", "price": "R$ 100"},
-                        {"name": "Colchão King", "price": "R$ 120"},
-                        {"name": "Travesseiro (unidade)", "price": "R$ 15"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "4",
-                    "category": "Tapetes e Carpetes",
-                    "items": [
-                        {"name": "Tapete pequeno (até 2m²)", "price": "R$ 40"},
-                        {"name": "Tapete médio (2-4m²)", "price": "R$ 60"},
-                        {"name": "Tapete grande (4-6m²)", "price": "R$ 80"},
-                        {"name": "Carpete (por m²)", "price": "R$ 25"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "5",
-                    "category": "Bancos Automotivos",
-                    "items": [
-                        {"name": "Banco dianteiro - Tecido", "price": "R$ 40"},
-                        {"name": "Banco dianteiro - Couro", "price": "R$ 60"},
-                        {"name": "Banco traseiro - Tecido", "price": "R$ 60"},
-                        {"name": "Banco traseiro - Couro", "price": "R$ 80"},
-                        {"name": "Conjunto completo - Tecido", "price": "R$ 150"},
-                        {"name": "Conjunto completo - Couro", "price": "R$ 200"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "6",
-                    "category": "Cortinas",
-                    "items": [
-                        {"name": "Cortina pequena (até 2m)", "price": "R$ 50"},
-                        {"name": "Cortina média (2-3m)", "price": "R$ 70"},
-                        {"name": "Cortina grande (3-4m)", "price": "R$ 90"},
-                        {"name": "Persiana", "price": "R$ 40"}
-                    ],
-                    "active": True,
-                    "created_at": datetime.utcnow()
+        created_at, contact_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(contact_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Rate limiting
+class InMemoryRateLimitBackend:
+    """Token buckets held in this process; limits are per worker."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        # pop + reinsert keeps the dict in least-recently-used order
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # Evict the idlest tenth in one go; they are the closest to full
+            for stale in list(itertools.islice(self._buckets, len(self._buckets) - self.max_keys * 9 // 10)):
+                del self._buckets[stale]
+        return retry_after
+
+class RedisRateLimitBackend:
+    """Token buckets shared by every worker through Redis."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str):
+        # Optional dependency, only needed when this backend is selected
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        retry_after = await self._script(keys=[f"ratelimit:{key}"], args=[capacity, rate, time.time()])
+        return float(retry_after)
+
+def create_rate_limit_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+rate_limit_backend = create_rate_limit_backend()
+
+_untrusted_forwarded_for_warned = False
+
+def client_ip(request: Request) -> str:
+    global _untrusted_forwarded_for_warned
+    peer = request.client.host if request.client else "unknown"
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if not forwarded_for:
+        return peer
+    if TRUSTED_PROXY_HOPS <= 0:
+        if not _untrusted_forwarded_for_warned:
+            _untrusted_forwarded_for_warned = True
+            logger.warning(
+                "Requests carry X-Forwarded-For but TRUSTED_PROXY_HOPS is 0: if they come "
+                f"through a proxy, all clients share its rate limit bucket ({peer})"
+            )
+        return peer
+    hops = [address.strip() for address in forwarded_for.split(",")]
+    if len(hops) < TRUSTED_PROXY_HOPS:
+        # Did not pass through every trusted proxy
+        return peer
+    return hops[-TRUSTED_PROXY_HOPS] or peer
+
+async def enforce_rate_limit(route: str, keys: List[str]):
+    limit = RATE_LIMITS[route]
+    rate = limit["per_minute"] / 60
+    retry_after = 0.0
+    for key in keys:
+        retry_after = max(retry_after, await rate_limit_backend.acquire(f"{route}:{key}", limit["capacity"], rate))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+
+# Circuit breaker
+class CircuitOpenError(Exception):
+    """Raised instead of calling through an open circuit breaker."""
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while.
+
+    Closed: calls go through; ``failure_threshold`` consecutive failures
+    (``failures`` exceptions or calls slower than ``timeout``) open it.
+    Open: calls raise ``CircuitOpenError`` until ``reset_timeout`` passes.
+    Half-open: a single trial call goes through; success closes the
+    breaker and failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, timeout: float,
+                 failures: tuple = (PyMongoError,)):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.failures = failures
+        self.state = "closed"
+        self._failure_count = 0
+        self._opened_at = 0.0
+        self._trial = False
+        metrics.inc("circuit_breaker_state", (name, "closed"))
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        metrics.inc("circuit_breaker_state", (self.name, self.state), -1)
+        metrics.inc("circuit_breaker_state", (self.name, state))
+        log = logger.warning if state == "open" else logger.info
+        log(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+
+    def _allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state("half_open")
+        if self.state == "half_open":
+            if self._trial:
+                return False
+            self._trial = True
+        return self.state != "open"
+
+    async def call(self, operation):
+        if not self._allow():
+            raise CircuitOpenError(f"circuit breaker {self.name} is open")
+        try:
+            result = await asyncio.wait_for(operation(), self.timeout or None)
+        except (asyncio.TimeoutError, *self.failures):
+            self._failure_count += 1
+            if self.state == "half_open" or self._failure_count >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state("open")
+            raise
+        finally:
+            # Any other error (a bug, a cancelled request) only ends the trial
+            self._trial = False
+        self._failure_count = 0
+        self._set_state("closed")
+        return result
+
+# Catalog cache
+class CachedPayload:
+    """A catalog value together with its serialized JSON."""
+
+    __slots__ = ("data", "json")
+
+    def __init__(self, data):
+        self.data = data
+        self.json = json_dumps(data)
+
+class CatalogSnapshot:
+    """Last catalog payloads read successfully, served while reads fail.
+
+    With a ``path`` the payloads are also written to that JSON file when
+    they change and read back by ``load`` at startup. ``defaults`` stand in
+    for keys that were never read.
+    """
+
+    def __init__(self, path: str = "", defaults: dict = None):
+        self.path = Path(path) if path else None
+        self._payloads = {key: CachedPayload(value) for key, value in (defaults or {}).items()}
+        self._write_lock = asyncio.Lock()
+
+    def get(self, key: str) -> Optional[CachedPayload]:
+        return self._payloads.get(key)
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            saved = json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read catalog snapshot {self.path}: {e}")
+            return
+        for key, value in saved.items():
+            self._payloads[key] = CachedPayload(value)
+        logger.info(f"Loaded catalog snapshot {self.path}: {', '.join(saved)}")
+
+    async def save(self, key: str, payload: CachedPayload):
+        previous = self._payloads.get(key)
+        self._payloads[key] = payload
+        if self.path is None or (previous is not None and previous.json == payload.json):
+            return
+        async with self._write_lock:
+            body = b"{" + b",".join(
+                json_dumps(name) + b":" + saved.json for name, saved in self._payloads.items()
+            ) + b"}"
+            try:
+                await asyncio.to_thread(self._write, body)
+            except OSError as e:
+                logger.warning(f"Could not write catalog snapshot {self.path}: {e}")
+
+    def _write(self, body: bytes):
+        # Written aside and renamed, so a crash never leaves a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_bytes(body)
+        os.replace(temporary, self.path)
+
+class CatalogCache:
+    """In-memory TTL cache for the public catalog payloads.
+
+    Admin write handlers invalidate the collections they touch and
+    ``CatalogWatcher`` relays changes made by other processes, so the TTL
+    only bounds staleness when neither sees a write.
+
+    Concurrent misses for a key share one in-flight load. With
+    ``refresh_ahead`` set, a hit on an entry that expires within that many
+    seconds starts a background reload and is still served the cached value.
+
+    Loads go through ``breaker``. When one fails or the breaker is open, the
+    key's payload from ``snapshot`` is served without being cached, so the
+    next lookup tries the database again.
+    """
+
+    def __init__(self, ttl: float, refresh_ahead: float, breaker: CircuitBreaker, snapshot: CatalogSnapshot):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.breaker = breaker
+        self.snapshot = snapshot
+        self._entries = {}
+        self._generations = {}
+        self._loads = {}
+
+    async def get_or_load(self, key: str, loader):
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            if self.refresh_ahead > 0 and entry[0] - now <= self.refresh_ahead and key not in self._loads:
+                metrics.inc("catalog_cache_requests_total", (key, "refresh"))
+                self._start_load(key, loader).add_done_callback(self._log_refresh_error)
+            else:
+                metrics.inc("catalog_cache_requests_total", (key, "hit"))
+            return entry[1]
+        load = self._loads.get(key)
+        if load is not None and load.generation == self._generations.get(key, 0):
+            metrics.inc("catalog_cache_requests_total", (key, "coalesced"))
+        else:
+            metrics.inc("catalog_cache_requests_total", (key, "miss"))
+            load = self._start_load(key, loader)
+        # Shielded so a cancelled request does not abort the shared load
+        return await asyncio.shield(load)
+
+    def _start_load(self, key: str, loader) -> asyncio.Task:
+        generation = self._generations.get(key, 0)
+        load = asyncio.create_task(self._load(key, loader, generation))
+        load.generation = generation
+        self._loads[key] = load
+        return load
+
+    async def _load(self, key: str, loader, generation: int):
+        try:
+            try:
+                value = CachedPayload(await self.breaker.call(loader))
+            except (CircuitOpenError, asyncio.TimeoutError, PyMongoError) as e:
+                return self._fallback(key, e)
+            # Skip storing if an invalidation happened while the load was in flight
+            if self.ttl > 0 and self._generations.get(key, 0) == generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            await self.snapshot.save(key, value)
+            return value
+        finally:
+            if self._loads.get(key) is asyncio.current_task():
+                del self._loads[key]
+
+    def _fallback(self, key: str, error: Exception) -> CachedPayload:
+        payload = self.snapshot.get(key)
+        if payload is None:
+            logger.error(f"Catalog read for {key} failed with no snapshot to serve: {error!r}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service temporarily unavailable",
+                headers={"Retry-After": str(int(self.breaker.reset_timeout) + 1)},
+            )
+        if isinstance(error, CircuitOpenError):
+            reason = "open"
+        else:
+            reason = "timeout" if isinstance(error, asyncio.TimeoutError) else "error"
+            logger.warning(f"Catalog read for {key} failed, serving last good snapshot: {error!r}")
+        metrics.inc("catalog_fallback_total", (key, reason))
+        return payload
+
+    @staticmethod
+    def _log_refresh_error(load: asyncio.Task):
+        if not load.cancelled() and load.exception() is not None:
+            logger.warning(f"Catalog cache refresh failed: {load.exception()}")
+
+    def invalidate(self, *keys: str):
+        # In-flight loads are left to finish; their callers get the value
+        # they asked for, but later lookups start a fresh load
+        for key in keys or list(self._entries):
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+# Served when there is no company document, and during an outage before it was ever read
+DEFAULT_COMPANY_INFO = {
+    "name": "TM Higienização",
+    "location": "Bertioga - São Paulo",
+    "phone": "(13) 99704-3410",
+    "whatsapp": "5513997043410",
+    "email": "contato@tmhigienizacao.com.br",
+    "address": "Bertioga, São Paulo",
+    "workingHours": "Segunda a Sábado: 8h às 18h"
+}
+
+catalog_breaker = CircuitBreaker(
+    "catalog", CATALOG_BREAKER_FAILURE_THRESHOLD, CATALOG_BREAKER_RESET_TIMEOUT, CATALOG_READ_TIMEOUT
+)
+catalog_snapshot = CatalogSnapshot(CATALOG_SNAPSHOT_PATH, defaults={"company_info": DEFAULT_COMPANY_INFO})
+catalog_cache = CatalogCache(CATALOG_CACHE_TTL, CATALOG_CACHE_REFRESH_AHEAD, catalog_breaker, catalog_snapshot)
+
+CATALOG_COLLECTIONS = ["services", "pricing", "testimonials", "company_info"]
+
+async def catalog_changed(collection_name: str):
+    # Invalidate locally and bump the version other workers poll when
+    # change streams are unavailable
+    catalog_cache.invalidate(collection_name)
+    try:
+        await db.catalog_versions.update_one({"_id": collection_name}, {"$inc": {"version": 1}}, upsert=True)
+    except PyMongoError as e:
+        logger.error(f"Error bumping catalog version for {collection_name}: {e}")
+
+class CatalogWatcher:
+    """Invalidates ``catalog_cache`` when the catalog changes in another process.
+
+    Follows a change stream on the catalog collections, resuming after
+    errors and invalidating everything whenever events may have been
+    missed. Change streams need a replica set or mongos; on a standalone
+    mongod the version counters bumped by ``catalog_changed`` are polled
+    instead, which only sees writes made through this API.
+    """
+
+    def __init__(self, mode: str, poll_interval: float):
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self._task = None
+
+    def start(self):
+        if self.mode == "off" or catalog_cache.ttl <= 0:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        mode = self.mode
+        if mode == "auto":
+            mode = "changestream" if await self._change_streams_supported() else "poll"
+        logger.info(f"Catalog cache sync: {mode}")
+        if mode == "changestream":
+            await self._watch()
+        else:
+            await self._poll()
+
+    async def _change_streams_supported(self) -> bool:
+        try:
+            hello = await client.admin.command("hello")
+        except Exception as e:
+            logger.warning(f"Could not detect change stream support: {e}")
+            return False
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    async def _watch(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": CATALOG_COLLECTIONS}}}]
+        resume_token = None
+        backoff = 1
+        while True:
+            try:
+                async with db.watch(pipeline, resume_after=resume_token) as stream:
+                    if resume_token is None:
+                        # Changes made before the stream opened were not seen
+                        catalog_cache.invalidate(*CATALOG_COLLECTIONS)
+                    backoff = 1
+                    async for change in stream:
+                        collection_name = change.get("ns", {}).get("coll")
+                        if collection_name:
+                            catalog_cache.invalidate(collection_name)
+                        else:
+                            catalog_cache.invalidate(*CATALOG_COLLECTIONS)
+                        resume_token = stream.resume_token
+            except PyMongoError as e:
+                logger.warning(f"Catalog change stream interrupted, retrying in {backoff}s: {e}")
+                if isinstance(e, OperationFailure):
+                    # e.g. the resume point fell off the oplog
+                    resume_token = None
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def _poll(self):
+        versions = None
+        while True:
+            try:
+                current = {
+                    document["_id"]: document.get("version", 0)
+                    for document in await db.catalog_versions.find({}).to_list(None)
                 }
-            ]
-            await db.pricing.insert_many(mock_pricing)
-            
-            # Insert mock testimonials
-            mock_testimonials = [
-                {
-                    "id": "1",
-                    "name": "Maria Silva",
-                    "location": "Bertioga Centro",
-                    "rating": 5,
-                    "text": "Serviço impecável! Meu sofá ficou como novo. Super recomendo a TM Higienização!",
-                    "active": True,
-                    "created_at": datetime.utcnow()
-                },
-                {
-                    "id": "2",
-                    "name": "João Santos",
-                    "location": "Jardim Esmeralda",
-                    "rating": 5,
-                    "text": "Profissionais muito competentes. Fizeram a limpeza dos bancos do meu carro e ficou perfeito.",
-                    "active": True,
-                    "created_at": datetime.utcnow()
+                if versions is not None:
+                    changed = [name for name, version in current.items() if versions.get(name) != version]
+                    if changed:
+                        catalog_cache.invalidate(*changed)
+                versions = current
+            except PyMongoError as e:
+                logger.warning(f"Error polling catalog versions: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+catalog_watcher = CatalogWatcher(CATALOG_SYNC_MODE, CATALOG_SYNC_POLL_INTERVAL)
+
+async def load_services():
+    return await db.services.find({"active": True}, {"_id": 0}).to_list(1000)
+
+async def load_pricing():
+    return await db.pricing.find({"active": True}, {"_id": 0}).to_list(1000)
+
+async def load_testimonials():
+    return await db.testimonials.find({"active": True}, {"_id": 0}).to_list(1000)
+
+async def load_company_info():
+    company = await db.company_info.find_one({}, {"_id": 0})
+    if not company:
+        # Return default
+        company = dict(DEFAULT_COMPANY_INFO)
+    return company
+
+# Delta sync
+def as_naive_utc(value: datetime) -> datetime:
+    # Stored timestamps are naive UTC (datetime.utcnow)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+async def record_tombstones(collection_name: str, ids: List[str]):
+    if not ids:
+        return
+    # One tombstone per id (collection_id is unique), moved forward on every
+    # delete so an id deleted again after being seeded is reported again
+    deleted_at = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"collection": collection_name, "id": item_id},
+            {"$max": {"deleted_at": deleted_at}},
+            upsert=True
+        )
+        for item_id in ids
+    ]
+    try:
+        await db.tombstones.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Two racing upserts of the same id: the loser's update now matches
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+        await db.tombstones.bulk_write(operations, ordered=False)
+
+async def delta_changes(collection_name: str, since: datetime, query: dict = None, active_only: bool = False) -> dict:
+    """Records of a collection changed after ``since`` and ids deleted since.
+
+    ``server_time`` is the ``since`` to send on the next sync. With
+    ``active_only`` deactivated records are reported as deleted, since
+    public listings only contain active ones. When ``since`` is older than
+    the tombstone retention deletions may be missing, so ``resync`` is set
+    and the client has to fetch the full listing again.
+    """
+    now = datetime.utcnow()
+    since = as_naive_utc(since)
+    server_time = now - timedelta(seconds=DELTA_SYNC_OVERLAP_SECONDS)
+    if since < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        return {"changed": [], "deleted": [], "resync": True, "server_time": server_time}
+
+    changed, tombstones = await asyncio.gather(
+        db[collection_name].find({**(query or {}), "updated_at": {"$gt": since}}, {"_id": 0}).to_list(None),
+        db.tombstones.find(
+            {"collection": collection_name, "deleted_at": {"$gt": since}}, {"_id": 0, "id": 1}
+        ).to_list(None)
+    )
+    deleted = [tombstone["id"] for tombstone in tombstones]
+    if active_only:
+        deleted += [document["id"] for document in changed if not document.get("active")]
+        changed = [document for document in changed if document.get("active")]
+    # An id seeded again after being deleted is current, not deleted
+    changed_ids = {document["id"] for document in changed}
+    deleted = [item_id for item_id in dict.fromkeys(deleted) if item_id not in changed_ids]
+    return {"changed": changed, "deleted": deleted, "resync": False, "server_time": server_time}
+
+def delta_response(items_key: str, delta: dict) -> dict:
+    return {
+        items_key: delta["changed"],
+        "deleted": delta["deleted"],
+        "resync": delta["resync"],
+        "server_time": delta["server_time"]
+    }
+
+# MongoDB indexes, applied idempotently at startup. company_info is a
+# single document without an "id" field, so it needs none.
+INDEXES = {
+    "services": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("active", ASCENDING)], name="active"),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "pricing": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("active", ASCENDING)], name="active"),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "testimonials": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("active", ASCENDING)], name="active"),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "contacts": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "contact_counters": [
+        IndexModel([("day", ASCENDING)], name="day", sparse=True),
+    ],
+    "tombstones": [
+        IndexModel([("collection", ASCENDING), ("deleted_at", ASCENDING)], name="collection_deleted_at"),
+        IndexModel([("collection", ASCENDING), ("id", ASCENDING)], name="collection_id", unique=True),
+        IndexModel(
+            [("deleted_at", ASCENDING)], name="deleted_at_ttl",
+            expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 24 * 60 * 60
+        ),
+    ],
+    # Revoked tokens are dropped once they expire; the "all" document has
+    # no expires_at and is kept
+    "token_revocations": [
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+def _index_signature(spec: dict):
+    keys = spec["key"].items() if hasattr(spec["key"], "items") else spec["key"]
+    partial = spec.get("partialFilterExpression")
+    return (
+        [(field, int(direction)) for field, direction in keys],
+        bool(spec.get("unique")),
+        bool(spec.get("sparse")),
+        dict(partial) if partial is not None else None,
+        spec.get("expireAfterSeconds")
+    )
+
+async def ensure_collection_indexes(collection_name: str, models: List[IndexModel]) -> List[str]:
+    collection = db[collection_name]
+    drift = []
+    try:
+        existing = await collection.index_information()
+        declared = {model.document["name"]: model.document for model in models}
+        for name, spec in declared.items():
+            if name in existing and _index_signature(existing[name]) != _index_signature(spec):
+                drift.append(f"{collection_name}.{name}: definition differs from registry")
+        for name in existing:
+            if name != "_id_" and name not in declared:
+                drift.append(f"{collection_name}.{name}: not declared in registry")
+        missing = [model for name, model in zip(declared, models) if name not in existing]
+        if missing:
+            created = await collection.create_indexes(missing)
+            logger.info(f"Created indexes on {collection_name}: {', '.join(created)}")
+    except PyMongoError as e:
+        logger.error(f"Error ensuring indexes on {collection_name}: {e}")
+    return drift
+
+async def ensure_indexes() -> List[str]:
+    results = await asyncio.gather(*(
+        ensure_collection_indexes(name, models) for name, models in INDEXES.items()
+    ))
+    drift = [message for messages in results for message in messages]
+    for message in drift:
+        logger.warning(f"Index drift: {message}")
+    return drift
+
+# Contact counters: one "all" document with totals by status and source,
+# plus one "day:YYYY-MM-DD" document per day with contacts created by source
+def counter_key(value: Optional[str], allowed: List[str]) -> str:
+    # Values become field names, so anything unexpected is bucketed
+    return value if value in allowed else "other"
+
+async def increment_contact_counters(contacts: List[dict], sign: int = 1):
+    totals = {}
+    days = {}
+    for contact in contacts:
+        status_key = counter_key(contact.get("status"), CONTACT_STATUSES)
+        source_key = counter_key(contact.get("source"), CONTACT_SOURCES)
+        day = days.setdefault(contact["created_at"].strftime("%Y-%m-%d"), {})
+        for counters, field in ((totals, "total"), (totals, f"status.{status_key}"), (totals, f"source.{source_key}"),
+                                (day, "total"), (day, f"source.{source_key}")):
+            counters[field] = counters.get(field, 0) + sign
+    if not totals:
+        return
+    try:
+        await asyncio.gather(
+            db.contact_counters.update_one({"_id": "all"}, {"$inc": totals}, upsert=True),
+            *(
+                db.contact_counters.update_one(
+                    {"_id": f"day:{day}"},
+                    {"$inc": increments, "$setOnInsert": {"day": day}},
+                    upsert=True
+                )
+                for day, increments in days.items()
+            )
+        )
+    except PyMongoError as e:
+        logger.error(f"Error updating contact counters: {e}")
+
+async def move_contact_status_counter(old_statuses: List[Optional[str]], new_status: str):
+    new_key = counter_key(new_status, CONTACT_STATUSES)
+    increments = {}
+    for old_status in old_statuses:
+        old_key = counter_key(old_status, CONTACT_STATUSES)
+        if old_key != new_key:
+            increments[f"status.{old_key}"] = increments.get(f"status.{old_key}", 0) - 1
+            increments[f"status.{new_key}"] = increments.get(f"status.{new_key}", 0) + 1
+    if not increments:
+        return
+    try:
+        await db.contact_counters.update_one({"_id": "all"}, {"$inc": increments}, upsert=True)
+    except PyMongoError as e:
+        logger.error(f"Error updating contact counters: {e}")
+
+async def reconcile_contact_counters() -> dict:
+    """Rebuild every contact counter document from the contacts collection."""
+    result = await db.contacts.aggregate([
+        {"$facet": {
+            "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "source": [{"$group": {"_id": "$source", "count": {"$sum": 1}}}],
+            "daily": [{"$group": {
+                "_id": {
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "source": "$source"
                 },
-                {
-                    "id": "3",
-                    "name": "Ana Costa",
-                    "location": "Vila Itapanhaú",
-                    "rating": 5,
-                    "text": "Atendimento excelente e preço justo. Já indiquei para várias amigas!",
-                    "active": True,
-                    "created_at": datetime.utcnow()
+                "count": {"$sum": 1}
+            }}]
+        }}
+    ]).to_list(1)
+    facets = result[0] if result else {"status": [], "source": [], "daily": []}
+
+    totals = {"_id": "all", "total": 0, "status": {}, "source": {}}
+    for group in facets["status"]:
+        key = counter_key(group["_id"], CONTACT_STATUSES)
+        totals["status"][key] = totals["status"].get(key, 0) + group["count"]
+        totals["total"] += group["count"]
+    for group in facets["source"]:
+        key = counter_key(group["_id"], CONTACT_SOURCES)
+        totals["source"][key] = totals["source"].get(key, 0) + group["count"]
+
+    days = {}
+    for group in facets["daily"]:
+        day = group["_id"]["day"]
+        key = counter_key(group["_id"].get("source"), CONTACT_SOURCES)
+        document = days.setdefault(day, {"_id": f"day:{day}", "day": day, "total": 0, "source": {}})
+        document["total"] += group["count"]
+        document["source"][key] = document["source"].get(key, 0) + group["count"]
+
+    documents = [totals, *days.values()]
+    await db.contact_counters.bulk_write([
+        ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in documents
+    ])
+    await db.contact_counters.delete_many({"_id": {"$nin": [document["_id"] for document in documents]}})
+    logger.info(f"Contact counters reconciled: {totals['total']} contacts, {len(days)} days")
+    return totals
+
+async def check_database() -> List[str]:
+    """Report setup the management commands (manage.py) still have to do.
+
+    Only existence lookups, so startup stays fast on any database size.
+    """
+    problems = []
+    try:
+        *catalog, counters, contact = await asyncio.gather(
+            *(db[name].find_one({}, {"_id": 1}) for name in CATALOG_COLLECTIONS),
+            db.contact_counters.find_one({"_id": "all"}, {"_id": 1}),
+            db.contacts.find_one({}, {"_id": 1})
+        )
+    except PyMongoError as e:
+        problems.append(f"database check failed: {e}")
+    else:
+        empty = [name for name, document in zip(CATALOG_COLLECTIONS, catalog) if document is None]
+        if empty:
+            problems.append(f"empty catalog collections ({', '.join(empty)}); run `python manage.py seed`")
+        # Databases created before counters existed need one full rebuild
+        if counters is None and contact is not None:
+            problems.append("contact counters missing; run `python manage.py reconcile-counters`")
+    for problem in problems:
+        logger.warning(f"Database check: {problem}")
+    return problems
+
+# Live contact events
+def sse_frame(event: str, data, event_id: int = None) -> bytes:
+    frame = b"event: " + event.encode() + b"\ndata: " + json_dumps(data) + b"\n\n"
+    if event_id is not None:
+        frame = b"id: " + str(event_id).encode() + b"\n" + frame
+    return frame
+
+class ContactEventBroker:
+    """In-process fan-out of contact changes to connected admin streams.
+
+    Each event is serialized once into an SSE frame and queued for every
+    subscriber. A subscriber that falls ``max_queue_size`` frames behind
+    has its backlog replaced by a single ``resync`` event. Only streams
+    served by this process receive its events.
+    """
+
+    def __init__(self, max_queue_size: int):
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, items: List[dict]):
+        if not self._subscribers:
+            return
+        frames = [sse_frame(event, item, next(self._ids)) for item in items]
+        for queue in self._subscribers:
+            for frame in frames:
+                try:
+                    queue.put_nowait(frame)
+                except asyncio.QueueFull:
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(sse_frame("resync", {}))
+                    break
+
+    def contacts_created(self, contacts: List[dict]):
+        # insert_one/insert_many add the ObjectId "_id" to the documents
+        self.publish("contact.created", [
+            {key: value for key, value in contact.items() if key != "_id"} for contact in contacts
+        ])
+
+    def contacts_updated(self, ids: List[str], changes: dict):
+        self.publish("contact.updated", [{"id": contact_id, **changes} for contact_id in ids])
+
+    def contacts_deleted(self, ids: List[str]):
+        self.publish("contact.deleted", [{"id": contact_id} for contact_id in ids])
+
+contact_events = ContactEventBroker(CONTACT_EVENTS_QUEUE_SIZE)
+
+# Contact write-behind buffer
+class ContactWriteBuffer:
+    """Bounded queue of new contacts flushed with insert_many.
+
+    A batch is written once it reaches ``batch_size`` documents or
+    ``flush_interval`` seconds after its first document, whichever comes
+    first. Contacts still queued are flushed by ``stop`` on shutdown.
+
+    A batch that fails with a retryable error (network, failover) is
+    retried with backoff before anything else is read from the queue, until
+    it is written; new contacts meanwhile fill the queue and then take the
+    direct path. Once stopping, a batch gets ``STOPPING_ATTEMPTS`` tries
+    and whatever is still unwritten after that is logged as lost.
+    """
+
+    RETRY_BACKOFF = 0.5
+    RETRY_BACKOFF_MAX = 30
+    STOPPING_ATTEMPTS = 3
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = None
+        self._task = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, contact: dict) -> bool:
+        # False tells the caller to write directly (buffer off or full)
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(contact)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._stopping.set()
+        await self._queue.put(None)
+        await self._task
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    contact = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if contact is None:
+                    stopping = True
+                    break
+                batch.append(contact)
+            if not await self._flush(batch):
+                # Stopping with the database still unreachable
+                lost = [contact["id"] for contact in self._drain()]
+                if lost:
+                    logger.error(f"Contact buffer stopped with {len(lost)} queued contacts lost; ids: {lost}")
+                break
+
+    def _drain(self) -> List[dict]:
+        contacts = []
+        while not self._queue.empty():
+            contact = self._queue.get_nowait()
+            if contact is not None:
+                contacts.append(contact)
+        return contacts
+
+    @staticmethod
+    def _retryable(error: PyMongoError) -> bool:
+        return isinstance(error, ConnectionFailure) or error.has_error_label("RetryableWriteError")
+
+    async def _flush(self, batch: List[dict]) -> bool:
+        # Returns False only when stopping made it give up on the batch
+        pending = batch
+        written = []
+        backoff = self.RETRY_BACKOFF
+        stopping_attempts = 0
+        while pending:
+            try:
+                await db.contacts.insert_many(pending, ordered=False)
+                written += pending
+                pending = []
+            except BulkWriteError as e:
+                # Duplicate keys are contacts an earlier attempt did write
+                # (its _id is kept on the document); other errors are final
+                failed = {
+                    error["index"] for error in e.details.get("writeErrors", []) if error.get("code") != 11000
                 }
-            ]
-            await db.testimonials.insert_many(mock_testimonials)
-            
-            # Insert company info
-            company_info = {
-                "name": "TM Higienização",
-                "location": "Bertioga - São Paulo",
-                "phone": "(13) 99704-3410",
-                "whatsapp": "5513997043410",
-                "email": "contato@tmhigienizacao.com.br",
-                "address": "Bertioga, São Paulo",
-                "workingHours": "Segunda a Sábado: 8h às 18h"
-            }
-            await db.company_info.insert_one(company_info)
-            
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+                written += [contact for i, contact in enumerate(pending) if i not in failed]
+                if failed:
+                    logger.error(
+                        f"Contact batch partially written, {len(failed)} lost: {e}; "
+                        f"ids: {[contact['id'] for i, contact in enumerate(pending) if i in failed]}"
+                    )
+                pending = []
+            except PyMongoError as e:
+                if not self._retryable(e):
+                    logger.error(f"Contact batch of {len(pending)} lost: {e}; ids: {[c['id'] for c in pending]}")
+                    pending = []
+                    break
+                if self._stopping.is_set():
+                    # Shutting down: a few quick attempts, then give up
+                    stopping_attempts += 1
+                    if stopping_attempts >= self.STOPPING_ATTEMPTS:
+                        logger.error(f"Contact batch of {len(pending)} lost: {e}; ids: {[c['id'] for c in pending]}")
+                        break
+                    logger.warning(f"Contact batch of {len(pending)} not written, retrying before shutdown: {e}")
+                    await asyncio.sleep(self.RETRY_BACKOFF)
+                else:
+                    logger.warning(f"Contact batch of {len(pending)} not written, retrying in {backoff}s: {e}")
+                    try:
+                        # Cut short by stop()
+                        await asyncio.wait_for(self._stopping.wait(), backoff)
+                    except asyncio.TimeoutError:
+                        pass
+                    backoff = min(backoff * 2, self.RETRY_BACKOFF_MAX)
+        if written:
+            await increment_contact_counters(written)
+            contact_events.contacts_created(written)
+        return not pending
+
+contact_buffer = ContactWriteBuffer(CONTACT_QUEUE_MAX_SIZE, CONTACT_BATCH_SIZE, CONTACT_FLUSH_INTERVAL)
+
+# Seed data for an empty database
+def seed_documents() -> dict:
+    services = [
+        {
+            "id": "1",
+            "title": "Sofás e Poltronas",
+            "description": "Higienização profunda com produtos específicos para cada tipo de tecido",
+            "icon": "Sofa",
+            "features": ["Remoção de manchas", "Eliminação de odores", "Proteção anti-ácaros"],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "2",
+            "title": "Colchões e Travesseiros",
+            "description": "Limpeza especializada para um sono mais saudável",
+            "icon": "Bed",
+            "features": ["Aspiração profunda", "Sanitização completa", "Secagem rápida"],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "3",
+            "title": "Tapetes e Carpetes",
+            "description": "Restauração da beleza original dos seus tapetes",
+            "icon": "Home",
+            "features": ["Lavagem com shampoo", "Remoção de pelos", "Impermeabilização"],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "4",
+            "title": "Bancos Automotivos",
+            "description": "Cuidado especial para o interior do seu veículo",
+            "icon": "Car",
+            "features": ["Limpeza de couro", "Tecidos automotivos", "Proteção UV"],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "5",
+            "title": "Cortinas",
+            "description": "Higienização sem retirar de casa",
+            "icon": "Sun",
+            "features": ["Limpeza no local", "Todos os tecidos", "Secagem natural"],
+            "active": True,
+            "created_at": datetime.utcnow()
+        }
+    ]
+
+    pricing = [
+        {
+            "id": "1",
+            "category": "Sofás",
+            "items": [
+                {"name": "Sofá 2 lugares - Tecido comum", "price": "R$ 80"},
+                {"name": "Sofá 2 lugares - Couro/Suede", "price": "R$ 100"},
+                {"name": "Sofá 3 lugares - Tecido comum", "price": "R$ 120"},
+                {"name": "Sofá 3 lugares - Couro/Suede", "price": "R$ 150"},
+                {"name": "Sofá de canto - Tecido comum", "price": "R$ 180"},
+                {"name": "Sofá de canto - Couro/Suede", "price": "R$ 220"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "2",
+            "category": "Poltronas e Cadeiras",
+            "items": [
+                {"name": "Poltrona - Tecido comum", "price": "R$ 50"},
+                {"name": "Poltrona - Couro/Suede", "price": "R$ 70"},
+                {"name": "Cadeira estofada", "price": "R$ 30"},
+                {"name": "Cadeira de couro", "price": "R$ 40"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "3",
+            "category": "Colchões",
+            "items": [
+                {"name": "Colchão Solteiro", "price": "R$ 60"},
+                {"name": "Colchão Casal", "price": "R$ 80"},
+                {"name": "Colchão Queen", "price": "R$ 100"},
+                {"name": "Colchão King", "price": "R$ 120"},
+                {"name": "Travesseiro (unidade)", "price": "R$ 15"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "4",
+            "category": "Tapetes e Carpetes",
+            "items": [
+                {"name": "Tapete pequeno (até 2m²)", "price": "R$ 40"},
+                {"name": "Tapete médio (2-4m²)", "price": "R$ 60"},
+                {"name": "Tapete grande (4-6m²)", "price": "R$ 80"},
+                {"name": "Carpete (por m²)", "price": "R$ 25"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "5",
+            "category": "Bancos Automotivos",
+            "items": [
+                {"name": "Banco dianteiro - Tecido", "price": "R$ 40"},
+                {"name": "Banco dianteiro - Couro", "price": "R$ 60"},
+                {"name": "Banco traseiro - Tecido", "price": "R$ 60"},
+                {"name": "Banco traseiro - Couro", "price": "R$ 80"},
+                {"name": "Conjunto completo - Tecido", "price": "R$ 150"},
+                {"name": "Conjunto completo - Couro", "price": "R$ 200"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "6",
+            "category": "Cortinas",
+            "items": [
+                {"name": "Cortina pequena (até 2m)", "price": "R$ 50"},
+                {"name": "Cortina média (2-3m)", "price": "R$ 70"},
+                {"name": "Cortina grande (3-4m)", "price": "R$ 90"},
+                {"name": "Persiana", "price": "R$ 40"}
+            ],
+            "active": True,
+            "created_at": datetime.utcnow()
+        }
+    ]
+
+    testimonials = [
+        {
+            "id": "1",
+            "name": "Maria Silva",
+            "location": "Bertioga Centro",
+            "rating": 5,
+            "text": "Serviço impecável! Meu sofá ficou como novo. Super recomendo a TM Higienização!",
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "2",
+            "name": "João Santos",
+            "location": "Jardim Esmeralda",
+            "rating": 5,
+            "text": "Profissionais muito competentes. Fizeram a limpeza dos bancos do meu carro e ficou perfeito.",
+            "active": True,
+            "created_at": datetime.utcnow()
+        },
+        {
+            "id": "3",
+            "name": "Ana Costa",
+            "location": "Vila Itapanhaú",
+            "rating": 5,
+            "text": "Atendimento excelente e preço justo. Já indiquei para várias amigas!",
+            "active": True,
+            "created_at": datetime.utcnow()
+        }
+    ]
+
+    company_info = {
+        "name": "TM Higienização",
+        "location": "Bertioga - São Paulo",
+        "phone": "(13) 99704-3410",
+        "whatsapp": "5513997043410",
+        "email": "contato@tmhigienizacao.com.br",
+        "address": "Bertioga, São Paulo",
+        "workingHours": "Segunda a Sábado: 8h às 18h"
+    }
+
+    for document in services + pricing + testimonials:
+        document["updated_at"] = document["created_at"]
+    company_info["updated_at"] = datetime.utcnow()
+
+    return {
+        "services": services,
+        "pricing": pricing,
+        "testimonials": testimonials,
+        "company_info": company_info
+    }
+
+# Initialize database with mock data (python manage.py seed)
+async def seed_collection(collection_name: str, documents: List[dict]) -> int:
+    # Only empty collections are seeded, so records deleted by an admin
+    # stay deleted and a partially seeded database is completed
+    collection = db[collection_name]
+    if await collection.find_one({}, {"_id": 1}) is not None:
+        return 0
+    try:
+        await collection.insert_many(documents, ordered=False)
+        inserted = len(documents)
+    except BulkWriteError as e:
+        # A concurrent seed already inserted these ids (rejected by the
+        # id_unique index, so ensure_indexes has to run first)
+        inserted = e.details.get("nInserted", 0)
+    if inserted:
+        await catalog_changed(collection_name)
+    return inserted
+
+# The seeded company document has a fixed _id, so concurrent seeds
+# upsert the same document instead of inserting one each
+COMPANY_INFO_ID = "company"
+
+async def seed_company_info(document: dict) -> int:
+    if await db.company_info.find_one({}, {"_id": 1}) is not None:
+        return 0
+    try:
+        result = await db.company_info.update_one(
+            {"_id": COMPANY_INFO_ID}, {"$setOnInsert": document}, upsert=True
+        )
+    except DuplicateKeyError:
+        return 0
+    if result.upserted_id is None:
+        return 0
+    await catalog_changed("company_info")
+    return 1
+
+async def seed_database() -> dict:
+    """Insert the default catalog into empty collections, concurrently.
+
+    Safe to run from several processes at once once the unique indexes
+    exist (``ensure_indexes``). Returns the number of documents inserted
+    per collection.
+    """
+    seed = seed_documents()
+    company_info = seed.pop("company_info")
+    counts = await asyncio.gather(
+        *(seed_collection(name, documents) for name, documents in seed.items()),
+        seed_company_info(company_info)
+    )
+    seed["company_info"] = company_info
+    logger.info(f"Database seeded: {dict(zip(seed, counts))}")
+    return dict(zip(seed, counts))
 
 # Public API Routes
 @api_router.get("/")
-async def root():
-    return {"message": "TM Higienização API", "version": "1.0.0"}
+async def root(request: Request):
+    return cacheable_response(request, "root", {"message": "TM Higienização API", "version": "1.0.0"})
 
 @api_router.get("/services")
-async def get_services():
-    services = await db.services.find({"active": True}, {"_id": 0}).to_list(1000)
-    return {"services": services}
+async def get_services(request: Request, since: Optional[datetime] = None):
+    if since is not None:
+        delta = await delta_changes("services", since, active_only=True)
+        return cacheable_response(request, "services", delta_response("services", delta))
+    services = await catalog_cache.get_or_load("services", load_services)
+    return catalog_response(request, "services", {"services": services})
 
 @api_router.get("/pricing")
-async def get_pricing():
-    pricing = await db.pricing.find({"active": True}, {"_id": 0}).to_list(1000)
-    return {"pricing": pricing}
+async def get_pricing(request: Request, since: Optional[datetime] = None):
+    if since is not None:
+        delta = await delta_changes("pricing", since, active_only=True)
+        return cacheable_response(request, "pricing", delta_response("pricing", delta))
+    pricing = await catalog_cache.get_or_load("pricing", load_pricing)
+    return catalog_response(request, "pricing", {"pricing": pricing})
 
 @api_router.get("/testimonials")
-async def get_testimonials():
-    testimonials = await db.testimonials.find({"active": True}, {"_id": 0}).to_list(1000)
-    return {"testimonials": testimonials}
+async def get_testimonials(request: Request, since: Optional[datetime] = None):
+    if since is not None:
+        delta = await delta_changes("testimonials", since, active_only=True)
+        return cacheable_response(request, "testimonials", delta_response("testimonials", delta))
+    testimonials = await catalog_cache.get_or_load("testimonials", load_testimonials)
+    return catalog_response(request, "testimonials", {"testimonials": testimonials})
 
 @api_router.get("/company-info")
-async def get_company_info():
-    company = await db.company_info.find_one({}, {"_id": 0})
-    if not company:
-        # Return default
-        company = {
-            "name": "TM Higienização",
-            "location": "Bertioga - São Paulo",
-            "phone": "(13) 99704-3410",
-            "whatsapp": "5513997043410",
-            "email": "contato@tmhigienizacao.com.br",
-            "address": "Bertioga, São Paulo",
-            "workingHours": "Segunda a Sábado: 8h às 18h"
-        }
-    return {"company": company}
+async def get_company_info(request: Request):
+    company = await catalog_cache.get_or_load("company_info", load_company_info)
+    return catalog_response(request, "company-info", {"company": company})
+
+@api_router.get("/site-bundle")
+async def get_site_bundle(request: Request):
+    # Everything the landing page needs in a single round trip
+    services, pricing, testimonials, company = await asyncio.gather(
+        catalog_cache.get_or_load("services", load_services),
+        catalog_cache.get_or_load("pricing", load_pricing),
+        catalog_cache.get_or_load("testimonials", load_testimonials),
+        catalog_cache.get_or_load("company_info", load_company_info),
+    )
+    return catalog_response(request, "site-bundle", {
+        "services": services,
+        "pricing": pricing,
+        "testimonials": testimonials,
+        "company": company
+    })
 
 @api_router.post("/contact")
-async def create_contact(contact_data: ContactCreate):
+async def create_contact(contact_data: ContactCreate, request: Request):
+    phone_digits = re.sub(r"\D", "", contact_data.phone)
+    keys = [f"ip:{client_ip(request)}"]
+    if phone_digits:
+        keys.append(f"phone:{phone_digits}")
+    await enforce_rate_limit("contact", keys)
     contact_dict = contact_data.dict()
     contact_obj = Contact(**contact_dict)
-    result = await db.contacts.insert_one(contact_obj.dict())
+    contact_doc = contact_obj.dict()
+    if not contact_buffer.enqueue(contact_doc):
+        await db.contacts.insert_one(contact_doc)
+        await increment_contact_counters([contact_doc])
+        contact_events.contacts_created([contact_doc])
     
     return {
         "success": True,
@@ -416,6 +2226,64 @@ async def create_contact(contact_data: ContactCreate):
         "contact_id": contact_obj.id
     }
 
+# Bulk admin operations
+def still_exists(read: dict, current: Optional[dict]) -> bool:
+    return current is not None
+
+async def bulk_apply(collection_name: str, ids: List[str], make_operation, projection: dict = None,
+                     applied=still_exists):
+    # One unordered bulk_write over the ids that exist. Operations filter on
+    # the fields as read, so a document changed in between is left alone;
+    # when fewer matched than were read, applied(read, current) tells which
+    # did. Returns (applied documents, per-item results, attributed), where
+    # attributed is False when racing writes make the applied list unsure.
+    ids = list(dict.fromkeys(ids))
+    collection = db[collection_name]
+    projection = projection or {"_id": 0, "id": 1}
+    found = await collection.find({"id": {"$in": ids}}, projection).to_list(len(ids))
+    outcome = {}
+    attributed = True
+    if found:
+        result = await collection.bulk_write([make_operation(document) for document in found], ordered=False)
+        matched = result.deleted_count + result.matched_count
+        if matched == len(found):
+            outcome = {document["id"]: "ok" for document in found}
+        else:
+            current = {
+                document["id"]: document
+                for document in await collection.find(
+                    {"id": {"$in": [document["id"] for document in found]}}, projection
+                ).to_list(len(found))
+            }
+            for document in found:
+                if applied(document, current.get(document["id"])):
+                    outcome[document["id"]] = "ok"
+                else:
+                    outcome[document["id"]] = "conflict" if document["id"] in current else "not_found"
+            attributed = list(outcome.values()).count("ok") == matched
+    results = [{"id": item_id, "result": outcome.get(item_id, "not_found")} for item_id in ids]
+    return [document for document in found if outcome[document["id"]] == "ok"], results, attributed
+
+async def bulk_delete(collection_name: str, ids: List[str], projection: dict = None):
+    # Every field read is part of the filter, so counters and events built
+    # from it match what was deleted
+    found, results, attributed = await bulk_apply(
+        collection_name, ids, lambda document: DeleteOne(document), projection,
+        applied=lambda read, current: current is None
+    )
+    await record_tombstones(collection_name, [document["id"] for document in found])
+    return found, results, attributed
+
+async def bulk_set_active(collection_name: str, ids: List[str], active: bool):
+    changes = {"active": active, "updated_at": datetime.utcnow()}
+    return await bulk_apply(
+        collection_name, ids,
+        lambda document: UpdateOne({"id": document["id"]}, {"$set": changes})
+    )
+
+def bulk_response(found: List[dict], results: List[dict]) -> dict:
+    return {"success": True, "matched": len(found), "results": results}
+
 # Admin Authentication Routes
 @admin_router.post("/login", response_model=Token)
 async def admin_login(credentials: AdminLogin):
@@ -433,13 +2301,25 @@ async def admin_login(credentials: AdminLogin):
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+@admin_router.post("/logout")
+async def admin_logout(credentials: HTTPAuthorizationCredentials = Depends(security), current_user: str = Depends(verify_token)):
+    await revoke_token(credentials.credentials)
+    return {"success": True}
+
+@admin_router.post("/logout-all")
+async def admin_logout_all(current_user: str = Depends(verify_token)):
+    await revoke_all_tokens()
+    return {"success": True}
+
 @admin_router.get("/verify")
 async def verify_admin_token(current_user: str = Depends(verify_token)):
     return {"valid": True, "user": current_user}
 
 # Admin Services Management
 @admin_router.get("/services")
-async def admin_get_services(current_user: str = Depends(verify_token)):
+async def admin_get_services(since: Optional[datetime] = None, current_user: str = Depends(verify_token)):
+    if since is not None:
+        return delta_response("services", await delta_changes("services", since))
     services = await db.services.find({}, {"_id": 0}).to_list(1000)
     return {"services": services}
 
@@ -448,6 +2328,7 @@ async def admin_create_service(service_data: ServiceCreate, current_user: str =
     service_dict = service_data.dict()
     service_obj = Service(**service_dict)
     await db.services.insert_one(service_obj.dict())
+    await catalog_changed("services")
     return service_obj
 
 @admin_router.put("/services/{service_id}")
@@ -455,24 +2336,46 @@ async def admin_update_service(service_id: str, service_data: ServiceUpdate, cur
     update_data = {k: v for k, v in service_data.dict().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
+    update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.services.update_one({"id": service_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    updated_service = await db.services.find_one_and_update(
+        {"id": service_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_service is None:
         raise HTTPException(status_code=404, detail="Service not found")
+    await catalog_changed("services")
     
-    updated_service = await db.services.find_one({"id": service_id}, {"_id": 0})
     return {"success": True, "service": updated_service}
 
+@admin_router.post("/services/bulk-active")
+async def admin_bulk_activate_services(bulk_data: BulkActiveUpdate, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_set_active("services", bulk_data.ids, bulk_data.active)
+    await catalog_changed("services")
+    return bulk_response(found, results)
+
+@admin_router.post("/services/bulk-delete")
+async def admin_bulk_delete_services(bulk_data: BulkIds, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_delete("services", bulk_data.ids)
+    await catalog_changed("services")
+    return bulk_response(found, results)
+
 @admin_router.delete("/services/{service_id}")
 async def admin_delete_service(service_id: str, current_user: str = Depends(verify_token)):
     result = await db.services.delete_one({"id": service_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Service not found")
+    await record_tombstones("services", [service_id])
+    await catalog_changed("services")
     return {"success": True, "message": "Service deleted"}
 
 # Admin Pricing Management
 @admin_router.get("/pricing")
-async def admin_get_pricing(current_user: str = Depends(verify_token)):
+async def admin_get_pricing(since: Optional[datetime] = None, current_user: str = Depends(verify_token)):
+    if since is not None:
+        return delta_response("pricing", await delta_changes("pricing", since))
     pricing = await db.pricing.find({}, {"_id": 0}).to_list(1000)
     return {"pricing": pricing}
 
@@ -481,6 +2384,7 @@ async def admin_create_pricing(pricing_data: PricingCategoryCreate, current_user
     pricing_dict = pricing_data.dict()
     pricing_obj = PricingCategory(**pricing_dict)
     await db.pricing.insert_one(pricing_obj.dict())
+    await catalog_changed("pricing")
     return pricing_obj
 
 @admin_router.put("/pricing/{pricing_id}")
@@ -488,24 +2392,46 @@ async def admin_update_pricing(pricing_id: str, pricing_data: PricingCategoryUpd
     update_data = {k: v for k, v in pricing_data.dict().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
+    update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.pricing.update_one({"id": pricing_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    updated_pricing = await db.pricing.find_one_and_update(
+        {"id": pricing_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_pricing is None:
         raise HTTPException(status_code=404, detail="Pricing category not found")
+    await catalog_changed("pricing")
     
-    updated_pricing = await db.pricing.find_one({"id": pricing_id}, {"_id": 0})
     return {"success": True, "pricing": updated_pricing}
 
+@admin_router.post("/pricing/bulk-active")
+async def admin_bulk_activate_pricing(bulk_data: BulkActiveUpdate, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_set_active("pricing", bulk_data.ids, bulk_data.active)
+    await catalog_changed("pricing")
+    return bulk_response(found, results)
+
+@admin_router.post("/pricing/bulk-delete")
+async def admin_bulk_delete_pricing(bulk_data: BulkIds, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_delete("pricing", bulk_data.ids)
+    await catalog_changed("pricing")
+    return bulk_response(found, results)
+
 @admin_router.delete("/pricing/{pricing_id}")
 async def admin_delete_pricing(pricing_id: str, current_user: str = Depends(verify_token)):
     result = await db.pricing.delete_one({"id": pricing_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Pricing category not found")
+    await record_tombstones("pricing", [pricing_id])
+    await catalog_changed("pricing")
     return {"success": True, "message": "Pricing category deleted"}
 
 # Admin Testimonials Management
 @admin_router.get("/testimonials")
-async def admin_get_testimonials(current_user: str = Depends(verify_token)):
+async def admin_get_testimonials(since: Optional[datetime] = None, current_user: str = Depends(verify_token)):
+    if since is not None:
+        return delta_response("testimonials", await delta_changes("testimonials", since))
     testimonials = await db.testimonials.find({}, {"_id": 0}).to_list(1000)
     return {"testimonials": testimonials}
 
@@ -514,6 +2440,7 @@ async def admin_create_testimonial(testimonial_data: TestimonialCreate, current_
     testimonial_dict = testimonial_data.dict()
     testimonial_obj = Testimonial(**testimonial_dict)
     await db.testimonials.insert_one(testimonial_obj.dict())
+    await catalog_changed("testimonials")
     return testimonial_obj
 
 @admin_router.put("/testimonials/{testimonial_id}")
@@ -521,19 +2448,39 @@ async def admin_update_testimonial(testimonial_id: str, testimonial_data: Testim
     update_data = {k: v for k, v in testimonial_data.dict().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
+    update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.testimonials.update_one({"id": testimonial_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    updated_testimonial = await db.testimonials.find_one_and_update(
+        {"id": testimonial_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_testimonial is None:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    await catalog_changed("testimonials")
     
-    updated_testimonial = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
     return {"success": True, "testimonial": updated_testimonial}
 
+@admin_router.post("/testimonials/bulk-active")
+async def admin_bulk_activate_testimonials(bulk_data: BulkActiveUpdate, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_set_active("testimonials", bulk_data.ids, bulk_data.active)
+    await catalog_changed("testimonials")
+    return bulk_response(found, results)
+
+@admin_router.post("/testimonials/bulk-delete")
+async def admin_bulk_delete_testimonials(bulk_data: BulkIds, current_user: str = Depends(verify_token)):
+    found, results, _ = await bulk_delete("testimonials", bulk_data.ids)
+    await catalog_changed("testimonials")
+    return bulk_response(found, results)
+
 @admin_router.delete("/testimonials/{testimonial_id}")
 async def admin_delete_testimonial(testimonial_id: str, current_user: str = Depends(verify_token)):
     result = await db.testimonials.delete_one({"id": testimonial_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    await record_tombstones("testimonials", [testimonial_id])
+    await catalog_changed("testimonials")
     return {"success": True, "message": "Testimonial deleted"}
 
 # Admin Company Info Management
@@ -544,36 +2491,275 @@ async def admin_get_company_info(current_user: str = Depends(verify_token)):
 
 @admin_router.put("/company-info")
 async def admin_update_company_info(company_data: CompanyInfo, current_user: str = Depends(verify_token)):
-    await db.company_info.replace_one({}, company_data.dict(), upsert=True)
-    updated_company = await db.company_info.find_one({}, {"_id": 0})
+    updated_company = await db.company_info.find_one_and_replace(
+        {},
+        {**company_data.dict(), "updated_at": datetime.utcnow()},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    await catalog_changed("company_info")
     return {"success": True, "company": updated_company}
 
+# Admin Dashboard Statistics
+async def catalog_counts(collection_name: str) -> dict:
+    result = await db[collection_name].aggregate([
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "active": [{"$match": {"active": True}}, {"$count": "count"}]
+        }}
+    ]).to_list(1)
+    facets = result[0] if result else {}
+    return {
+        "total": facets["total"][0]["count"] if facets.get("total") else 0,
+        "active": facets["active"][0]["count"] if facets.get("active") else 0
+    }
+
+async def contact_stats(days: int) -> dict:
+    since = (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    totals, daily, recent = await asyncio.gather(
+        db.contact_counters.find_one({"_id": "all"}),
+        db.contact_counters.find({"day": {"$gte": since}}, {"_id": 0}).sort("day", 1).to_list(days),
+        db.contacts.find({}, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).limit(5).to_list(5)
+    )
+    totals = totals or {}
+    return {
+        "total": totals.get("total", 0),
+        "by_status": {**{key: 0 for key in CONTACT_STATUSES}, **totals.get("status", {})},
+        "by_source": {**{key: 0 for key in CONTACT_SOURCES}, **totals.get("source", {})},
+        "daily": daily,
+        "recent": recent
+    }
+
+@admin_router.get("/stats")
+async def admin_get_stats(days: int = Query(30, ge=1, le=366), current_user: str = Depends(verify_token)):
+    contacts, services, pricing, testimonials = await asyncio.gather(
+        contact_stats(days),
+        catalog_counts("services"),
+        catalog_counts("pricing"),
+        catalog_counts("testimonials")
+    )
+    return {
+        "contacts": contacts,
+        "services": services,
+        "pricing": pricing,
+        "testimonials": testimonials
+    }
+
+@admin_router.post("/stats/reconcile")
+async def admin_reconcile_stats(current_user: str = Depends(verify_token)):
+    totals = await reconcile_contact_counters()
+    return {"success": True, "total": totals["total"], "by_status": totals["status"], "by_source": totals["source"]}
+
+# Admin Slow Query Monitoring
+@admin_router.get("/slow-queries")
+async def admin_get_slow_queries(limit: int = Query(SLOW_QUERY_TOP_N, ge=1, le=500), current_user: str = Depends(verify_token)):
+    return {
+        "threshold_ms": slow_query_monitor.threshold_ms,
+        "queries": slow_query_monitor.top(limit)
+    }
+
+@admin_router.delete("/slow-queries")
+async def admin_reset_slow_queries(current_user: str = Depends(verify_token)):
+    slow_query_monitor.reset()
+    return {"success": True}
+
 # Admin Contacts Management
+async def count_contacts(query: dict, status_filter: Optional[str], q: Optional[str]) -> int:
+    # Unfiltered and status-only totals come from the contact counters;
+    # only text searches count matching documents
+    if not q and (not status_filter or status_filter in CONTACT_STATUSES):
+        counters = await db.contact_counters.find_one({"_id": "all"})
+        if counters is not None:
+            if status_filter:
+                return counters.get("status", {}).get(status_filter, 0)
+            return counters.get("total", 0)
+    return await db.contacts.count_documents(query)
+
 @admin_router.get("/contacts")
-async def admin_get_contacts(current_user: str = Depends(verify_token)):
-    contacts = await db.contacts.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return {"contacts": contacts}
+async def admin_get_contacts(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = None,
+    since: Optional[datetime] = None,
+    current_user: str = Depends(verify_token)
+):
+    query = {}
+    if status_filter:
+        query["status"] = status_filter
+    if q:
+        pattern = {"$regex": re.escape(q.strip()), "$options": "i"}
+        query["$or"] = [{field: pattern} for field in ("name", "phone", "email", "message")]
+    if since is not None:
+        return delta_response("contacts", await delta_changes("contacts", since, query))
+
+    # Keyset pagination on (created_at, id), newest first
+    page_query = dict(query)
+    if cursor:
+        created_at, contact_id = decode_contacts_cursor(cursor)
+        page_query = {"$and": [query, {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": contact_id}}
+        ]}]}
+
+    # The total is only computed for the first page; clients keep it while
+    # following cursors, so later pages cost a single index range read
+    page = db.contacts.find(page_query, {"_id": 0}).sort([("created_at", -1), ("id", -1)]).limit(limit + 1)
+    if cursor:
+        contacts, total = await page.to_list(limit + 1), None
+    else:
+        contacts, total = await asyncio.gather(page.to_list(limit + 1), count_contacts(query, status_filter, q))
+    next_cursor = None
+    if len(contacts) > limit:
+        contacts = contacts[:limit]
+        next_cursor = encode_contacts_cursor(contacts[-1])
+    return {"contacts": contacts, "total": total, "next_cursor": next_cursor}
+
+@admin_router.post("/contacts/stream-ticket")
+async def admin_create_stream_ticket(credentials: HTTPAuthorizationCredentials = Depends(security), current_user: str = Depends(verify_token)):
+    ticket = create_stream_ticket(token_session(credentials.credentials))
+    return {"ticket": ticket, "expires_in": STREAM_TICKET_TTL}
+
+@admin_router.get("/contacts/stream")
+async def admin_stream_contacts(session: dict = Depends(verify_stream_token)):
+    async def event_stream():
+        queue = contact_events.subscribe()
+        try:
+            yield b"retry: 5000\n\n"
+            check_at = time.monotonic() + CONTACT_EVENTS_HEARTBEAT
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), max(0, check_at - time.monotonic()))
+                except asyncio.TimeoutError:
+                    # Idle: keep proxies from timing the stream out
+                    frame = b": keep-alive\n\n"
+                # Checked on a timer, busy or idle, so the stream ends soon
+                # after the admin token expires or is revoked
+                if time.monotonic() >= check_at:
+                    if not session_active(session):
+                        return
+                    check_at = time.monotonic() + CONTACT_EVENTS_HEARTBEAT
+                yield frame
+        finally:
+            contact_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@admin_router.post("/contacts/bulk-status")
+async def admin_bulk_update_contact_status(bulk_data: BulkStatusUpdate, current_user: str = Depends(verify_token)):
+    now = datetime.utcnow()
+    # At BSON precision, so the stamp read back matches when checking which updates applied
+    changes = {"status": bulk_data.status, "updated_at": now.replace(microsecond=now.microsecond // 1000 * 1000)}
+    # Filtering on the status as read keeps the counter move exact when
+    # another request changes the same contact in between
+    found, results, attributed = await bulk_apply(
+        "contacts", bulk_data.ids,
+        lambda document: UpdateOne({"id": document["id"], "status": document.get("status")}, {"$set": changes}),
+        projection={"_id": 0, "id": 1, "status": 1, "updated_at": 1},
+        applied=lambda read, current: current is not None and current.get("updated_at") == changes["updated_at"]
+    )
+    if attributed:
+        await move_contact_status_counter([document.get("status") for document in found], bulk_data.status)
+    else:
+        # Another request stamped the same millisecond, so which updates
+        # applied is unsure: rebuild the counters instead
+        await reconcile_contact_counters()
+    contact_events.contacts_updated([document["id"] for document in found], changes)
+    return bulk_response(found, results)
+
+@admin_router.post("/contacts/bulk-delete")
+async def admin_bulk_delete_contacts(bulk_data: BulkIds, current_user: str = Depends(verify_token)):
+    found, results, attributed = await bulk_delete(
+        "contacts", bulk_data.ids, projection={"_id": 0, "id": 1, "status": 1, "source": 1, "created_at": 1}
+    )
+    if attributed:
+        await increment_contact_counters(found, -1)
+    else:
+        # Which request deleted which contact is unknown, so the status
+        # counters of either could be off: rebuild them instead
+        await reconcile_contact_counters()
+    contact_events.contacts_deleted([document["id"] for document in found])
+    return bulk_response(found, results)
 
 @admin_router.put("/contacts/{contact_id}/status")
 async def admin_update_contact_status(contact_id: str, status_data: ContactStatusUpdate, current_user: str = Depends(verify_token)):
-    result = await db.contacts.update_one({"id": contact_id}, {"$set": {"status": status_data.status}})
-    if result.matched_count == 0:
+    changes = {"status": status_data.status, "updated_at": datetime.utcnow()}
+    previous = await db.contacts.find_one_and_update(
+        {"id": contact_id},
+        {"$set": changes},
+        projection={"_id": 0}
+    )
+    if previous is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await move_contact_status_counter([previous.get("status")], status_data.status)
+    contact_events.contacts_updated([contact_id], changes)
     
-    updated_contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
+    # The pre-image is needed for the counters; only these fields changed
+    updated_contact = {**previous, **changes}
     return {"success": True, "contact": updated_contact}
 
 @admin_router.delete("/contacts/{contact_id}")
 async def admin_delete_contact(contact_id: str, current_user: str = Depends(verify_token)):
-    result = await db.contacts.delete_one({"id": contact_id})
-    if result.deleted_count == 0:
+    contact = await db.contacts.find_one_and_delete({"id": contact_id}, {"_id": 0})
+    if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await increment_contact_counters([contact], -1)
+    await record_tombstones("contacts", [contact_id])
+    contact_events.contacts_deleted([contact_id])
     return {"success": True, "message": "Contact deleted"}
 
+# Prometheus metrics
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Health probes
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    # Liveness only; database trouble shows up in /readyz so that it takes
+    # instances out of rotation instead of getting them restarted
+    return JSONResponse({"status": "ok"}, headers={"Cache-Control": "no-store"})
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    pools = pool_stats.snapshot()
+    body = {"pool": {"max_pool_size": MONGO_MAX_POOL_SIZE, "servers": pools}}
+    headers = {"Cache-Control": "no-store"}
+
+    # Every connection busy with requests queued: a ping would only queue too
+    saturated = [
+        server for server, pool in pools.items()
+        if MONGO_MAX_POOL_SIZE and pool["in_use"] >= MONGO_MAX_POOL_SIZE and pool["waiting"] > 0
+    ]
+    if saturated:
+        return JSONResponse(
+            {"status": "unavailable", "reason": f"connection pool saturated: {', '.join(saturated)}", **body},
+            status_code=503, headers=headers
+        )
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), READINESS_TIMEOUT)
+    except asyncio.TimeoutError:
+        reason = f"ping timed out after {READINESS_TIMEOUT}s"
+    except PyMongoError as e:
+        reason = f"ping failed: {e}"
+    else:
+        body["ping_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return JSONResponse({"status": "ready", **body}, headers=headers)
+    return JSONResponse({"status": "unavailable", "reason": reason, **body}, status_code=503, headers=headers)
+
 # Include routers
 app.include_router(api_router)
 app.include_router(admin_router)
 
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -582,6 +2768,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it is outermost and sees every request
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -591,8 +2780,22 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
 async def startup_event():
-    await init_database()
+    # Seeding and counter rebuilds are management commands; startup only
+    # applies missing indexes and reports what is left to do
+    catalog_snapshot.load()
+    await asyncio.gather(ensure_indexes(), check_database())
+    try:
+        await token_revocation_sync.refresh()
+    except PyMongoError as e:
+        logger.warning(f"Could not load token revocations: {e}")
+    token_revocation_sync.start()
+    if CONTACT_WRITE_MODE == "buffered":
+        contact_buffer.start()
+    catalog_watcher.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await catalog_watcher.stop()
+    await token_revocation_sync.stop()
+    await contact_buffer.stop()
     client.close()
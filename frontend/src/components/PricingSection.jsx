@@ -15,7 +15,7 @@ const PricingSection = () => {
     const fetchPricing = async () => {
       try {
         setLoading(true);
-        const pricingData = await apiService.getPricing();
+        const { pricing: pricingData } = await apiService.getSiteBundle();
         setPricing(pricingData);
         if (pricingData.length > 0) {
           setSelectedCategory(pricingData[0].category);
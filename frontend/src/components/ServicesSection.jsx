@@ -14,7 +14,7 @@ const ServicesSection = () => {
     const fetchServices = async () => {
       try {
         setLoading(true);
-        const servicesData = await apiService.getServices();
+        const { services: servicesData } = await apiService.getSiteBundle();
         setServices(servicesData);
         setError(null);
       } catch (err) {
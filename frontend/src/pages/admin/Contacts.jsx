@@ -1,8 +1,9 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Card, CardContent, CardHeader } from '../../components/ui/card';
 import { Button } from '../../components/ui/button';
 import { Input } from '../../components/ui/input';
 import { Badge } from '../../components/ui/badge';
+import { Checkbox } from '../../components/ui/checkbox';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '../../components/ui/select';
 import { 
   Users, 
@@ -18,13 +19,22 @@ import {
 import { adminAPI } from '../../services/api';
 import { useToast } from '../../hooks/use-toast';
 
+const PAGE_SIZE = 50;
+
 const Contacts = () => {
   const [contacts, setContacts] = useState([]);
-  const [filteredContacts, setFilteredContacts] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [statusCounts, setStatusCounts] = useState({});
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
+  const [selectedIds, setSelectedIds] = useState([]);
   const { toast } = useToast();
+  const liveEventHandler = useRef(null);
+  const statusCountsTimeout = useRef(null);
 
   const statusOptions = [
     { value: 'all', label: 'Todos os Status' },
@@ -34,19 +44,45 @@ const Contacts = () => {
     { value: 'closed', label: 'Fechado' }
   ];
 
+  useEffect(() => {
+    const timeout = setTimeout(() => setDebouncedSearch(searchTerm.trim()), 300);
+    return () => clearTimeout(timeout);
+  }, [searchTerm]);
+
   useEffect(() => {
     fetchContacts();
+  }, [debouncedSearch, statusFilter]);
+
+  useEffect(() => {
+    fetchStatusCounts();
   }, []);
 
   useEffect(() => {
-    filterContacts();
-  }, [contacts, searchTerm, statusFilter]);
+    const unsubscribe = adminAPI.subscribeContactEvents(
+      (type, data) => liveEventHandler.current(type, data)
+    );
+    return () => {
+      unsubscribe();
+      clearTimeout(statusCountsTimeout.current);
+    };
+  }, []);
+
+  const buildParams = (cursor) => {
+    const params = { limit: PAGE_SIZE };
+    if (cursor) params.cursor = cursor;
+    if (statusFilter !== 'all') params.status = statusFilter;
+    if (debouncedSearch) params.q = debouncedSearch;
+    return params;
+  };
 
   const fetchContacts = async () => {
     try {
       setLoading(true);
-      const data = await adminAPI.getContacts();
-      setContacts(data);
+      const data = await adminAPI.listContacts(buildParams());
+      setContacts(data.contacts);
+      setSelectedIds([]);
+      setTotal(data.total);
+      setNextCursor(data.next_cursor);
     } catch (error) {
       toast({
         title: '❌ Erro',
@@ -58,26 +94,75 @@ const Contacts = () => {
     }
   };
 
-  const filterContacts = () => {
-    let filtered = contacts;
-
-    // Filter by search term
-    if (searchTerm) {
-      filtered = filtered.filter(contact =>
-        contact.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        contact.phone.includes(searchTerm) ||
-        contact.email?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        contact.message.toLowerCase().includes(searchTerm.toLowerCase())
-      );
+  const loadMoreContacts = async () => {
+    try {
+      setLoadingMore(true);
+      const data = await adminAPI.listContacts(buildParams(nextCursor));
+      // Only the first page carries the total
+      setContacts((current) => [...current, ...data.contacts]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      toast({
+        title: '❌ Erro',
+        description: 'Erro ao carregar contatos',
+        variant: 'destructive'
+      });
+    } finally {
+      setLoadingMore(false);
     }
+  };
 
-    // Filter by status
-    if (statusFilter !== 'all') {
-      filtered = filtered.filter(contact => contact.status === statusFilter);
+  const fetchStatusCounts = async () => {
+    try {
+      const data = await adminAPI.getStats();
+      setStatusCounts(data.contacts.by_status);
+    } catch (error) {
+      console.error('Error fetching contact counts:', error);
     }
+  };
 
-    setFilteredContacts(filtered);
+  const refreshContacts = () => {
+    fetchContacts();
+    fetchStatusCounts();
+  };
+
+  // Coalesce the stats request when events arrive in bursts (bulk actions)
+  const scheduleStatusCounts = () => {
+    clearTimeout(statusCountsTimeout.current);
+    statusCountsTimeout.current = setTimeout(fetchStatusCounts, 1000);
+  };
+
+  const handleContactEvent = (type, data) => {
+    if (type === 'resync') {
+      refreshContacts();
+      return;
+    }
+    const loaded = contacts.some((contact) => contact.id === data.id);
+    const matchesStatus = (contact) => statusFilter === 'all' || contact.status === statusFilter;
+
+    if (type === 'contact.created') {
+      // New contacts can only be placed without a search; they are newest first
+      if (!loaded && !debouncedSearch && matchesStatus(data)) {
+        setContacts((current) => [data, ...current]);
+        setTotal((current) => current + 1);
+      }
+    } else if (type === 'contact.updated' && loaded) {
+      if (matchesStatus(data)) {
+        setContacts((current) =>
+          current.map((contact) => (contact.id === data.id ? { ...contact, ...data } : contact))
+        );
+      } else {
+        setContacts((current) => current.filter((contact) => contact.id !== data.id));
+        setTotal((current) => Math.max(current - 1, 0));
+      }
+    } else if (type === 'contact.deleted' && loaded) {
+      setContacts((current) => current.filter((contact) => contact.id !== data.id));
+      setSelectedIds((current) => current.filter((id) => id !== data.id));
+      setTotal((current) => Math.max(current - 1, 0));
+    }
+    scheduleStatusCounts();
   };
+  liveEventHandler.current = handleContactEvent;
 
   const updateContactStatus = async (contactId, newStatus) => {
     try {
@@ -86,7 +171,7 @@ const Contacts = () => {
         title: '✅ Sucesso',
         description: 'Status do contato atualizado'
       });
-      fetchContacts();
+      refreshContacts();
     } catch (error) {
       toast({
         title: '❌ Erro',
@@ -104,7 +189,7 @@ const Contacts = () => {
           title: '✅ Sucesso',
           description: 'Contato excluído com sucesso'
         });
-        fetchContacts();
+        refreshContacts();
       } catch (error) {
         toast({
           title: '❌ Erro',
@@ -115,6 +200,54 @@ const Contacts = () => {
     }
   };
 
+  const toggleSelected = (contactId) => {
+    setSelectedIds((current) =>
+      current.includes(contactId)
+        ? current.filter((id) => id !== contactId)
+        : [...current, contactId]
+    );
+  };
+
+  const toggleSelectAll = () => {
+    setSelectedIds(selectedIds.length === contacts.length ? [] : contacts.map((contact) => contact.id));
+  };
+
+  const bulkUpdateStatus = async (newStatus) => {
+    try {
+      const result = await adminAPI.bulkUpdateContactStatus(selectedIds, newStatus);
+      toast({
+        title: '✅ Sucesso',
+        description: `${result.matched} contato(s) atualizado(s)`
+      });
+      refreshContacts();
+    } catch (error) {
+      toast({
+        title: '❌ Erro',
+        description: 'Erro ao atualizar status',
+        variant: 'destructive'
+      });
+    }
+  };
+
+  const bulkDelete = async () => {
+    if (window.confirm(`Tem certeza que deseja excluir ${selectedIds.length} contato(s)?`)) {
+      try {
+        const result = await adminAPI.bulkDeleteContacts(selectedIds);
+        toast({
+          title: '✅ Sucesso',
+          description: `${result.matched} contato(s) excluído(s)`
+        });
+        refreshContacts();
+      } catch (error) {
+        toast({
+          title: '❌ Erro',
+          description: 'Erro ao excluir contatos',
+          variant: 'destructive'
+        });
+      }
+    }
+  };
+
   const getStatusColor = (status) => {
     switch (status) {
       case 'pending': return 'bg-yellow-100 text-yellow-800 border-yellow-200';
@@ -137,7 +270,7 @@ const Contacts = () => {
     window.open(url, '_blank');
   };
 
-  if (loading) {
+  if (loading && contacts.length === 0) {
     return (
       <div className="flex items-center justify-center h-64">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-purple-600"></div>
@@ -150,13 +283,13 @@ const Contacts = () => {
       {/* Header */}
       <div>
         <h1 className="text-3xl font-bold text-gray-900">Gerenciar Contatos</h1>
-        <p className="text-gray-600">Administre os contatos recebidos pelo site</p>
+        <p className="text-gray-600">Administre os contatos recebidos pelo site ({total} encontrados)</p>
       </div>
 
       {/* Stats */}
       <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
         {statusOptions.slice(1).map((status) => {
-          const count = contacts.filter(c => c.status === status.value).length;
+          const count = statusCounts[status.value] ?? 0;
           return (
             <Card key={status.value}>
               <CardContent className="p-4">
@@ -209,15 +342,64 @@ const Contacts = () => {
         </CardContent>
       </Card>
 
+      {/* Bulk Actions */}
+      {contacts.length > 0 && (
+        <Card>
+          <CardContent className="p-4">
+            <div className="flex flex-col md:flex-row md:items-center gap-4">
+              <div className="flex items-center space-x-2 flex-1">
+                <Checkbox
+                  checked={selectedIds.length > 0 && selectedIds.length === contacts.length}
+                  onCheckedChange={toggleSelectAll}
+                />
+                <span className="text-sm text-gray-600">
+                  {selectedIds.length > 0 ? `${selectedIds.length} selecionado(s)` : 'Selecionar todos'}
+                </span>
+              </div>
+              {selectedIds.length > 0 && (
+                <div className="flex space-x-2">
+                  <Select onValueChange={bulkUpdateStatus}>
+                    <SelectTrigger className="w-full md:w-48">
+                      <SelectValue placeholder="Alterar status" />
+                    </SelectTrigger>
+                    <SelectContent>
+                      {statusOptions.slice(1).map((option) => (
+                        <SelectItem key={option.value} value={option.value}>
+                          {option.label}
+                        </SelectItem>
+                      ))}
+                    </SelectContent>
+                  </Select>
+                  <Button
+                    variant="outline"
+                    onClick={bulkDelete}
+                    className="text-red-600 hover:text-red-700"
+                  >
+                    <Trash2 className="h-4 w-4 mr-1" />
+                    Excluir
+                  </Button>
+                </div>
+              )}
+            </div>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Contacts List */}
       <div className="grid gap-4">
-        {filteredContacts.map((contact) => (
+        {contacts.map((contact) => (
           <Card key={contact.id} className="hover:shadow-lg transition-shadow duration-200">
             <CardContent className="p-6">
               <div className="flex flex-col lg:flex-row lg:items-center justify-between space-y-4 lg:space-y-0">
                 <div className="flex-1 space-y-3">
                   <div className="flex items-center justify-between">
-                    <h3 className="text-lg font-semibold text-gray-900">{contact.name}</h3>
+                    <div className="flex items-center space-x-3">
+                      <Checkbox
+                        checked={selectedIds.includes(contact.id)}
+                        onCheckedChange={() => toggleSelected(contact.id)}
+                      />
+                      <h3 className="text-lg font-semibold text-gray-900">{contact.name}</h3>
+                    </div>
                     <Badge className={getStatusColor(contact.status)}>
                       {getStatusLabel(contact.status)}
                     </Badge>
@@ -296,7 +478,15 @@ const Contacts = () => {
           </Card>
         ))}
         
-        {filteredContacts.length === 0 && (
+        {nextCursor && (
+          <div className="text-center">
+            <Button variant="outline" onClick={loadMoreContacts} disabled={loadingMore}>
+              {loadingMore ? 'Carregando...' : `Carregar mais (${contacts.length} de ${total})`}
+            </Button>
+          </div>
+        )}
+
+        {contacts.length === 0 && (
           <Card>
             <CardContent className="text-center py-12">
               <Users className="mx-auto h-12 w-12 text-gray-400 mb-4" />
@@ -32,23 +32,18 @@ const Dashboard = () => {
   const fetchDashboardData = async () => {
     try {
       setLoading(true);
-      const [contacts, services, pricing, testimonials] = await Promise.all([
-        adminAPI.getContacts(),
-        adminAPI.getServices(),
-        adminAPI.getPricing(),
-        adminAPI.getTestimonials()
-      ]);
+      const data = await adminAPI.getStats();
 
       setStats({
-        totalContacts: contacts.length,
-        totalServices: services.length,
-        totalPricing: pricing.length,
-        totalTestimonials: testimonials.length,
-        pendingContacts: contacts.filter(c => c.status === 'pending').length
+        totalContacts: data.contacts.total,
+        totalServices: data.services.total,
+        totalPricing: data.pricing.total,
+        totalTestimonials: data.testimonials.total,
+        pendingContacts: data.contacts.by_status.pending
       });
 
       // Get recent contacts (last 5)
-      setRecentContacts(contacts.slice(0, 5));
+      setRecentContacts(data.contacts.recent);
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
     } finally {
@@ -43,8 +43,29 @@ api.interceptors.response.use(
   }
 );
 
+// Landing page bundle: sections mounting together share one in-flight
+// request; once it settles the next mount fetches again, so admin edits
+// show up without a reload
+let siteBundlePromise = null;
+
 // Public API calls
 export const apiService = {
+  // Site bundle (services, pricing, testimonials and company info)
+  getSiteBundle() {
+    if (!siteBundlePromise) {
+      siteBundlePromise = api.get('/site-bundle')
+        .then((response) => response.data)
+        .catch((error) => {
+          console.error('Error fetching site bundle:', error);
+          throw error;
+        })
+        .finally(() => {
+          siteBundlePromise = null;
+        });
+    }
+    return siteBundlePromise;
+  },
+
   // Services
   async getServices() {
     try {
@@ -127,9 +148,21 @@ export const adminAPI = {
   },
 
   logout() {
+    const token = getToken();
+    if (token) {
+      // Revoke server-side; the token is removed locally either way
+      api.post('/admin/logout', null, { headers: { Authorization: `Bearer ${token}` } })
+        .catch(() => {});
+    }
     removeToken();
   },
 
+  // Dashboard Statistics
+  async getStats() {
+    const response = await api.get('/admin/stats');
+    return response.data;
+  },
+
   // Services Management
   async getServices() {
     const response = await api.get('/admin/services');
@@ -151,6 +184,16 @@ export const adminAPI = {
     return response.data;
   },
 
+  async bulkSetServicesActive(ids, active) {
+    const response = await api.post('/admin/services/bulk-active', { ids, active });
+    return response.data;
+  },
+
+  async bulkDeleteServices(ids) {
+    const response = await api.post('/admin/services/bulk-delete', { ids });
+    return response.data;
+  },
+
   // Pricing Management
   async getPricing() {
     const response = await api.get('/admin/pricing');
@@ -172,6 +215,16 @@ export const adminAPI = {
     return response.data;
   },
 
+  async bulkSetPricingActive(ids, active) {
+    const response = await api.post('/admin/pricing/bulk-active', { ids, active });
+    return response.data;
+  },
+
+  async bulkDeletePricing(ids) {
+    const response = await api.post('/admin/pricing/bulk-delete', { ids });
+    return response.data;
+  },
+
   // Testimonials Management
   async getTestimonials() {
     const response = await api.get('/admin/testimonials');
@@ -193,6 +246,16 @@ export const adminAPI = {
     return response.data;
   },
 
+  async bulkSetTestimonialsActive(ids, active) {
+    const response = await api.post('/admin/testimonials/bulk-active', { ids, active });
+    return response.data;
+  },
+
+  async bulkDeleteTestimonials(ids) {
+    const response = await api.post('/admin/testimonials/bulk-delete', { ids });
+    return response.data;
+  },
+
   // Company Info Management
   async getCompanyInfo() {
     const response = await api.get('/admin/company-info');
@@ -210,6 +273,61 @@ export const adminAPI = {
     return response.data.contacts;
   },
 
+  // Paginated contacts: { limit, cursor, status, q } -> { contacts, total, next_cursor }
+  async listContacts(params = {}) {
+    const response = await api.get('/admin/contacts', { params });
+    return response.data;
+  },
+
+  // Live contact changes; returns a function that closes the stream.
+  // EventSource cannot send headers, so each connection first asks for a
+  // short-lived stream ticket and sends that in the query string.
+  subscribeContactEvents(onEvent) {
+    let source = null;
+    let retryTimeout = null;
+    let connected = false;
+    let closed = false;
+
+    const reconnect = () => {
+      if (!closed) retryTimeout = setTimeout(connect, 5000);
+    };
+
+    const connect = async () => {
+      let ticket;
+      try {
+        const response = await api.post('/admin/contacts/stream-ticket');
+        ticket = response.data.ticket;
+      } catch (error) {
+        // 401 is handled by the response interceptor
+        if (error.response?.status !== 401) reconnect();
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(`${API_BASE_URL}/admin/contacts/stream?ticket=${encodeURIComponent(ticket)}`);
+      source.onopen = () => {
+        // Events sent while disconnected are lost, so resync on reconnect
+        if (connected) onEvent('resync', {});
+        connected = true;
+      };
+      source.onerror = () => {
+        // The ticket in the URL expires, so reconnect with a new one
+        // instead of letting EventSource retry the same URL
+        source.close();
+        reconnect();
+      };
+      ['contact.created', 'contact.updated', 'contact.deleted', 'resync'].forEach((type) => {
+        source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+      });
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimeout);
+      if (source) source.close();
+    };
+  },
+
   async updateContactStatus(contactId, status) {
     const response = await api.put(`/admin/contacts/${contactId}/status`, { status });
     return response.data;
@@ -218,6 +336,16 @@ export const adminAPI = {
   async deleteContact(contactId) {
     const response = await api.delete(`/admin/contacts/${contactId}`);
     return response.data;
+  },
+
+  async bulkUpdateContactStatus(ids, status) {
+    const response = await api.post('/admin/contacts/bulk-status', { ids, status });
+    return response.data;
+  },
+
+  async bulkDeleteContacts(ids) {
+    const response = await api.post('/admin/contacts/bulk-delete', { ids });
+    return response.data;
   }
 };
 
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """An empty in-memory database in place of MongoDB."""
+    client = AsyncMongoMockClient()
+    database = client["test_database"]
+    monkeypatch.setattr(server, "client", client)
+    monkeypatch.setattr(server, "db", database)
+    return database
+
+
+@pytest.fixture
+async def api(db):
+    """HTTP client for the app, with the catalog cache emptied."""
+    server.catalog_cache.invalidate()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    server.catalog_cache.invalidate()
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def contacts(db):
+    documents = [
+        {"id": f"c{index}", "name": f"Cliente {index}", "status": "pending", "source": "form",
+         "created_at": datetime(2024, 5, 1, 12, index), "updated_at": datetime(2024, 5, 1, 12, index)}
+        for index in range(1, 4)
+    ]
+    await db.contacts.insert_many([dict(document) for document in documents])
+    await server.reconcile_contact_counters()
+    return documents
+
+
+@pytest.fixture
+def before_bulk_write(db, monkeypatch):
+    """Run a coroutine between the read and the write of the next bulk_write on a collection."""
+    collection_type = type(db.contacts)
+    original = collection_type.bulk_write
+    hooks = {}
+
+    async def bulk_write(self, *args, **kwargs):
+        hook = hooks.pop(self.name, None)
+        if hook is not None:
+            await hook()
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection_type, "bulk_write", bulk_write)
+
+    def register(collection_name, hook):
+        hooks[collection_name] = hook
+    return register
+
+
+async def counters(db):
+    # Counters as maintained incrementally, without the zeroed entries a
+    # rebuild drops
+    document = await db.contact_counters.find_one({"_id": "all"})
+    return document["total"], {key: value for key, value in document["status"].items() if value}
+
+
+async def recounted(db):
+    total = await db.contacts.count_documents({})
+    statuses = {}
+    async for contact in db.contacts.find({}):
+        statuses[contact["status"]] = statuses.get(contact["status"], 0) + 1
+    return total, statuses
+
+
+def by_id(response):
+    return {item["id"]: item["result"] for item in response["results"]}
+
+
+@pytest.fixture
+def reconciled(monkeypatch):
+    calls = []
+    reconcile = server.reconcile_contact_counters
+
+    async def tracked_reconcile():
+        calls.append(1)
+        return await reconcile()
+    monkeypatch.setattr(server, "reconcile_contact_counters", tracked_reconcile)
+    return calls
+
+
+async def test_bulk_status_skips_contact_changed_in_between(db, contacts, before_bulk_write, reconciled):
+    async def other_request():
+        # Stamped a later millisecond than the bulk update
+        await asyncio.sleep(0.002)
+        await server.admin_update_contact_status(
+            "c1", server.ContactStatusUpdate(status="contacted"), current_user="admin"
+        )
+    before_bulk_write("contacts", other_request)
+
+    response = await server.admin_bulk_update_contact_status(
+        server.BulkStatusUpdate(ids=["c1", "c2", "missing"], status="closed"), current_user="admin"
+    )
+
+    assert by_id(response) == {"c1": "conflict", "c2": "ok", "missing": "not_found"}
+    assert response["matched"] == 1
+    assert (await db.contacts.find_one({"id": "c1"}))["status"] == "contacted"
+    assert reconciled == []
+    assert await counters(db) == await recounted(db) == (3, {"pending": 1, "contacted": 1, "closed": 1})
+
+
+async def test_bulk_status_racing_the_same_millisecond_rebuilds_counters(db, contacts, before_bulk_write, reconciled):
+    async def other_request():
+        await server.admin_update_contact_status(
+            "c1", server.ContactStatusUpdate(status="contacted"), current_user="admin"
+        )
+    before_bulk_write("contacts", other_request)
+    # Both requests stamp the same millisecond, so the re-read cannot tell
+    # which update set it
+    stamp = []
+    original = server.datetime
+
+    class FrozenDatetime(original):
+        @classmethod
+        def utcnow(cls):
+            if not stamp:
+                stamp.append(original.utcnow().replace(microsecond=0))
+            return stamp[0]
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(server, "datetime", FrozenDatetime)
+        await server.admin_bulk_update_contact_status(
+            server.BulkStatusUpdate(ids=["c1", "c2"], status="closed"), current_user="admin"
+        )
+
+    assert reconciled == [1]
+    assert await counters(db) == await recounted(db) == (3, {"pending": 1, "contacted": 1, "closed": 1})
+
+
+async def test_bulk_delete_skips_contact_changed_in_between(db, contacts, before_bulk_write, reconciled):
+    async def other_request():
+        await server.admin_update_contact_status(
+            "c1", server.ContactStatusUpdate(status="converted"), current_user="admin"
+        )
+    before_bulk_write("contacts", other_request)
+
+    response = await server.admin_bulk_delete_contacts(server.BulkIds(ids=["c1", "c2"]), current_user="admin")
+
+    assert by_id(response) == {"c1": "conflict", "c2": "ok"}
+    assert reconciled == []
+    assert await db.contacts.find_one({"id": "c1"}) is not None
+    assert await counters(db) == await recounted(db) == (2, {"pending": 1, "converted": 1})
+    assert await db.tombstones.distinct("id") == ["c2"]
+
+
+async def test_bulk_delete_racing_a_delete_rebuilds_counters(db, contacts, before_bulk_write, reconciled):
+    async def other_request():
+        await server.admin_delete_contact("c1", current_user="admin")
+    before_bulk_write("contacts", other_request)
+
+    response = await server.admin_bulk_delete_contacts(server.BulkIds(ids=["c1", "c2"]), current_user="admin")
+
+    # Both are gone but only one delete matched: which one is unknown
+    assert await db.contacts.count_documents({"id": {"$in": ["c1", "c2"]}}) == 0
+    assert set(by_id(response).values()) <= {"ok", "not_found"}
+    assert reconciled == [1]
+    assert await counters(db) == await recounted(db) == (1, {"pending": 1})
+
+
+async def test_bulk_delete_without_races_moves_counters(db, contacts, reconciled):
+    response = await server.admin_bulk_delete_contacts(server.BulkIds(ids=["c1", "c3", "c9"]), current_user="admin")
+
+    assert by_id(response) == {"c1": "ok", "c3": "ok", "c9": "not_found"}
+    assert reconciled == []
+    assert await counters(db) == await recounted(db) == (1, {"pending": 1})
+
+
+async def test_bulk_active_reports_document_deleted_in_between(db, before_bulk_write):
+    await db.services.insert_many([
+        {"id": service_id, "title": service_id, "active": False, "updated_at": datetime.utcnow()}
+        for service_id in ("s1", "s2")
+    ])
+
+    async def other_request():
+        await server.admin_delete_service("s1", current_user="admin")
+    before_bulk_write("services", other_request)
+
+    response = await server.admin_bulk_activate_services(
+        server.BulkActiveUpdate(ids=["s1", "s2"], active=True), current_user="admin"
+    )
+
+    assert by_id(response) == {"s1": "not_found", "s2": "ok"}
+    assert (await db.services.find_one({"id": "s2"}))["active"] is True
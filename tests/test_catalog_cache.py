@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def make_cache(ttl=60, refresh_ahead=0):
+    breaker = server.CircuitBreaker("test", failure_threshold=5, reset_timeout=30, timeout=0)
+    return server.CatalogCache(ttl, refresh_ahead, breaker, server.CatalogSnapshot())
+
+
+class Loader:
+    """Loader that counts calls and returns when released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return [{"id": str(call)}]
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = make_cache()
+    loader = Loader()
+    lookups = [asyncio.create_task(cache.get_or_load("services", loader)) for _ in range(10)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    payloads = await asyncio.gather(*lookups)
+    assert loader.calls == 1
+    assert all(payload is payloads[0] for payload in payloads)
+    assert payloads[0].data == [{"id": "1"}]
+
+
+async def test_hit_does_not_load_again():
+    cache = make_cache()
+    loader = Loader()
+    loader.release.set()
+    first = await cache.get_or_load("services", loader)
+    second = await cache.get_or_load("services", loader)
+    assert loader.calls == 1
+    assert second is first
+
+
+async def test_invalidation_during_load_is_not_cached():
+    cache = make_cache()
+    loader = Loader()
+    lookup = asyncio.create_task(cache.get_or_load("services", loader))
+    await asyncio.sleep(0)
+    cache.invalidate("services")
+    loader.release.set()
+    # The caller still gets the value it asked for
+    assert (await lookup).data == [{"id": "1"}]
+    # but it was read before the write, so the next lookup loads again
+    assert (await cache.get_or_load("services", loader)).data == [{"id": "2"}]
+    assert loader.calls == 2
+
+
+async def test_lookup_after_invalidation_does_not_join_stale_load():
+    cache = make_cache()
+    loader = Loader()
+    stale = asyncio.create_task(cache.get_or_load("services", loader))
+    await asyncio.sleep(0)
+    cache.invalidate("services")
+    fresh = asyncio.create_task(cache.get_or_load("services", loader))
+    await asyncio.sleep(0)
+    loader.release.set()
+    assert (await stale).data == [{"id": "1"}]
+    assert (await fresh).data == [{"id": "2"}]
+    assert (await cache.get_or_load("services", loader)).data == [{"id": "2"}]
+    assert loader.calls == 2
+
+
+async def test_cancelled_caller_does_not_abort_shared_load():
+    cache = make_cache()
+    loader = Loader()
+    cancelled = asyncio.create_task(cache.get_or_load("services", loader))
+    waiting = asyncio.create_task(cache.get_or_load("services", loader))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    loader.release.set()
+    assert (await waiting).data == [{"id": "1"}]
+    assert loader.calls == 1
+
+
+async def test_refresh_ahead_serves_cached_value_while_reloading():
+    cache = make_cache(ttl=0.2, refresh_ahead=0.15)
+    loader = Loader()
+    loader.release.set()
+    first = await cache.get_or_load("services", loader)
+    await asyncio.sleep(0.1)
+    # Within the refresh window: served from cache, reload started
+    assert await cache.get_or_load("services", loader) is first
+    await asyncio.sleep(0.01)
+    assert loader.calls == 2
+    assert (await cache.get_or_load("services", loader)).data == [{"id": "2"}]
+    assert loader.calls == 2
+
+
+async def test_zero_ttl_loads_every_time():
+    cache = make_cache(ttl=0)
+    loader = Loader()
+    loader.release.set()
+    await cache.get_or_load("services", loader)
+    await cache.get_or_load("services", loader)
+    assert loader.calls == 2
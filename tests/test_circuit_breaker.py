@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import AutoReconnect
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def ok():
+    return "ok"
+
+
+async def failing():
+    raise AutoReconnect("connection refused")
+
+
+async def hanging():
+    await asyncio.sleep(10)
+
+
+def make_breaker(failure_threshold=2, reset_timeout=0.05, timeout=0):
+    return server.CircuitBreaker("test", failure_threshold, reset_timeout, timeout)
+
+
+async def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(AutoReconnect):
+            await breaker.call(failing)
+    assert breaker.state == "open"
+
+
+async def test_opens_after_consecutive_failures():
+    breaker = make_breaker(failure_threshold=3)
+    for _ in range(2):
+        with pytest.raises(AutoReconnect):
+            await breaker.call(failing)
+    assert breaker.state == "closed"
+    with pytest.raises(AutoReconnect):
+        await breaker.call(failing)
+    assert breaker.state == "open"
+
+
+async def test_success_resets_failure_count():
+    breaker = make_breaker(failure_threshold=2)
+    with pytest.raises(AutoReconnect):
+        await breaker.call(failing)
+    assert await breaker.call(ok) == "ok"
+    with pytest.raises(AutoReconnect):
+        await breaker.call(failing)
+    assert breaker.state == "closed"
+
+
+async def test_open_breaker_does_not_call_through():
+    breaker = make_breaker(reset_timeout=30)
+    await open_breaker(breaker)
+    calls = []
+
+    async def operation():
+        calls.append(1)
+
+    with pytest.raises(server.CircuitOpenError):
+        await breaker.call(operation)
+    assert calls == []
+
+
+async def test_slow_call_counts_as_failure():
+    breaker = make_breaker(failure_threshold=1, timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await breaker.call(hanging)
+    assert breaker.state == "open"
+
+
+async def test_other_errors_do_not_count():
+    breaker = make_breaker(failure_threshold=1)
+
+    async def bug():
+        raise KeyError("id")
+
+    with pytest.raises(KeyError):
+        await breaker.call(bug)
+    assert breaker.state == "closed"
+
+
+async def test_half_open_success_closes():
+    breaker = make_breaker()
+    await open_breaker(breaker)
+    await asyncio.sleep(0.06)
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == "closed"
+
+
+async def test_half_open_failure_opens_again():
+    breaker = make_breaker()
+    await open_breaker(breaker)
+    await asyncio.sleep(0.06)
+    with pytest.raises(AutoReconnect):
+        await breaker.call(failing)
+    assert breaker.state == "open"
+    with pytest.raises(server.CircuitOpenError):
+        await breaker.call(ok)
+
+
+async def test_half_open_allows_a_single_trial():
+    breaker = make_breaker()
+    await open_breaker(breaker)
+    await asyncio.sleep(0.06)
+    release = asyncio.Event()
+
+    async def trial():
+        await release.wait()
+        return "trial"
+
+    first = asyncio.create_task(breaker.call(trial))
+    await asyncio.sleep(0)
+    assert breaker.state == "half_open"
+    with pytest.raises(server.CircuitOpenError):
+        await breaker.call(ok)
+    release.set()
+    assert await first == "trial"
+    assert breaker.state == "closed"
+
+
+def make_cache(snapshot=None, ttl=60):
+    breaker = make_breaker(failure_threshold=2, reset_timeout=30)
+    return server.CatalogCache(ttl, 0, breaker, snapshot or server.CatalogSnapshot())
+
+
+async def test_failed_load_serves_last_good_payload_without_caching_it():
+    cache = make_cache(ttl=0)
+    good = await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "1"}]))
+    assert await cache.get_or_load("services", failing) is good
+    # Not cached: the next lookup reads the database again
+    assert (await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "2"}]))).data == [{"id": "2"}]
+
+
+async def test_open_breaker_serves_snapshot_without_loading():
+    cache = make_cache(ttl=0)
+    good = await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "1"}]))
+    await open_breaker(cache.breaker)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return []
+
+    assert await cache.get_or_load("services", loader) is good
+    assert calls == []
+
+
+async def test_no_snapshot_is_503_with_retry_after():
+    cache = make_cache()
+    with pytest.raises(HTTPException) as raised:
+        await cache.get_or_load("pricing", failing)
+    assert raised.value.status_code == 503
+    assert raised.value.headers["Retry-After"] == "31"
+
+
+async def test_snapshot_defaults_stand_in_for_keys_never_read():
+    snapshot = server.CatalogSnapshot(defaults={"company_info": server.DEFAULT_COMPANY_INFO})
+    cache = make_cache(snapshot)
+    assert (await cache.get_or_load("company_info", failing)).data == server.DEFAULT_COMPANY_INFO
+
+
+async def test_snapshot_persists_to_disk(tmp_path):
+    path = tmp_path / "snapshot" / "catalog.json"
+    cache = make_cache(server.CatalogSnapshot(str(path)))
+    await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "1", "title": "Sofás"}]))
+    assert path.exists()
+
+    # A restarted process serves it before MongoDB comes back
+    restarted = server.CatalogSnapshot(str(path))
+    restarted.load()
+    cache = make_cache(restarted)
+    assert (await cache.get_or_load("services", failing)).data == [{"id": "1", "title": "Sofás"}]
+
+
+async def test_unchanged_payload_is_not_rewritten(tmp_path):
+    path = tmp_path / "catalog.json"
+    cache = make_cache(server.CatalogSnapshot(str(path)), ttl=0)
+    await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "1"}]))
+    path.write_text("{}")
+    await cache.get_or_load("services", lambda: asyncio.sleep(0, [{"id": "1"}]))
+    assert path.read_text() == "{}"
@@ -0,0 +1,145 @@
+import gzip
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+# br when the optional brotli package is installed
+PREFERRED = server.COMPRESSION_ENCODINGS[0]
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", PREFERRED),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", PREFERRED),
+    ("*;q=0, gzip", "gzip"),
+    ("br;q=0, *", "gzip"),
+    ("gzip;q=bogus", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert server.negotiate_encoding(accept_encoding) == expected
+
+
+def scope(accept_encoding="gzip"):
+    return {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+
+def app_sending(*messages, **headers):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+        })
+        for message in messages:
+            await send({"type": "http.response.body", **message})
+    return app
+
+
+async def run(app, accept_encoding="gzip", minimum_size=500):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await server.CompressionMiddleware(app, minimum_size=minimum_size)(scope(accept_encoding), None, send)
+    return sent
+
+
+def headers_of(start):
+    return {name.decode(): value.decode() for name, value in start["headers"]}
+
+
+async def test_compresses_buffered_body_with_encoding_specific_etag():
+    body = b'{"services": []}' * 100
+    start, message = await run(app_sending({"body": body}, content_type="application/json", etag='"abc"'))
+    headers = headers_of(start)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["etag"] == '"abc-gzip"'
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(message["body"])
+    assert gzip.decompress(message["body"]) == body
+
+
+@pytest.mark.skipif(server.brotli is None, reason="brotli is not installed")
+async def test_brotli_when_preferred():
+    body = b"x" * 1000
+    start, message = await run(app_sending({"body": body}), accept_encoding="br, gzip")
+    assert headers_of(start)["content-encoding"] == "br"
+    assert server.brotli.decompress(message["body"]) == body
+
+
+async def test_small_body_passes_through():
+    body = b"x" * 499
+    start, message = await run(app_sending({"body": body}, etag='"abc"'))
+    assert "content-encoding" not in headers_of(start)
+    assert headers_of(start)["etag"] == '"abc"'
+    assert message["body"] == body
+
+
+async def test_not_compressed_without_accept_encoding():
+    body = b"x" * 1000
+    start, message = await run(app_sending({"body": body}), accept_encoding="identity")
+    assert "content-encoding" not in headers_of(start)
+    assert message["body"] == body
+
+
+async def test_already_encoded_body_passes_through():
+    body = gzip.compress(b"x" * 1000)
+    start, message = await run(app_sending({"body": body}, content_encoding="gzip"))
+    assert message["body"] == body
+
+
+async def test_chunked_body_passes_through():
+    chunks = [{"body": b"x" * 1000, "more_body": True}, {"body": b"y" * 1000}]
+    start, first, second = await run(app_sending(*chunks))
+    assert "content-encoding" not in headers_of(start)
+    assert (first["body"], second["body"]) == (b"x" * 1000, b"y" * 1000)
+
+
+async def test_event_stream_is_not_buffered():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send_event):
+        await send_event({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"text/event-stream")],
+        })
+        # The client has the headers before the first event
+        assert [message["type"] for message in sent] == ["http.response.start"]
+        await send_event({"type": "http.response.body", "body": b"data: x\n\n" * 100, "more_body": True})
+        assert len(sent) == 2 and sent[1]["body"].startswith(b"data:")
+
+    await server.CompressionMiddleware(app, minimum_size=10)(scope(), None, send)
+    assert "content-encoding" not in headers_of(sent[0])
+
+
+async def test_catalog_route_serves_precompressed_variant(api, db):
+    await db.services.insert_many([
+        {"id": str(index), "title": f"Serviço {index}", "description": "Higienização " * 20,
+         "active": True, "updated_at": datetime.utcnow()}
+        for index in range(10)
+    ])
+    plain = await api.get("/api/services", headers={"Accept-Encoding": "identity"})
+    compressed = await api.get("/api/services", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert compressed.json() == plain.json()
+    # Each variant revalidates against its own tag
+    revalidated = await api.get(
+        "/api/services", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    mismatched = await api.get(
+        "/api/services", headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["etag"]}
+    )
+    assert mismatched.status_code == 200
@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeContacts:
+    """contacts collection whose insert_many fails as scripted, then writes."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+        self.documents = {}
+
+    async def insert_many(self, documents, ordered=True):
+        self.calls += 1
+        error = self.errors.pop(0) if self.errors else None
+        if callable(error):
+            error = error(self, documents)
+        if error is not None and not isinstance(error, BulkWriteError):
+            raise error
+        for document in documents:
+            self.documents.setdefault(document["id"], document)
+        if error is not None:
+            raise error
+
+
+class FakeDatabase:
+    def __init__(self, database, contacts):
+        self._database = database
+        self.contacts = contacts
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+
+def written_then_lost(contacts, documents):
+    # The insert went through but the acknowledgement was lost
+    for document in documents:
+        contacts.documents[document["id"]] = document
+    return AutoReconnect("connection reset")
+
+
+def duplicates(*indexes):
+    return BulkWriteError({"writeErrors": [{"index": index, "code": 11000, "errmsg": "E11000"} for index in indexes]})
+
+
+def retryable_label():
+    return OperationFailure("primary stepped down", code=189, details={"errorLabels": ["RetryableWriteError"]})
+
+
+@pytest.fixture
+def use_contacts(db, monkeypatch):
+    def install(contacts):
+        monkeypatch.setattr(server, "db", FakeDatabase(db, contacts))
+        return contacts
+    return install
+
+
+@pytest.fixture
+def buffer():
+    contact_buffer = server.ContactWriteBuffer(max_size=100, batch_size=10, flush_interval=0.01)
+    contact_buffer.RETRY_BACKOFF = 0.01
+    return contact_buffer
+
+
+def contact(index):
+    return {"id": f"c{index}", "name": "Cliente", "status": "pending", "source": "form", "created_at": datetime.utcnow()}
+
+
+async def counted(db):
+    counters = await db.contact_counters.find_one({"_id": "all"})
+    return counters["total"] if counters else 0
+
+
+@pytest.mark.parametrize("error", [AutoReconnect("connection refused"), retryable_label()])
+async def test_transient_error_is_retried_until_written(db, use_contacts, buffer, error):
+    contacts = use_contacts(FakeContacts(error, error))
+    assert await buffer._flush([contact(1), contact(2)])
+    assert contacts.calls == 3
+    assert set(contacts.documents) == {"c1", "c2"}
+    assert await counted(db) == 2
+
+
+async def test_duplicate_keys_on_retry_count_as_written(db, use_contacts, buffer):
+    contacts = use_contacts(FakeContacts(written_then_lost, duplicates(0, 1)))
+    assert await buffer._flush([contact(1), contact(2)])
+    assert contacts.calls == 2
+    assert await counted(db) == 2
+
+
+async def test_non_retryable_error_drops_the_batch(db, use_contacts, buffer):
+    contacts = use_contacts(FakeContacts(OperationFailure("document failed validation", code=121)))
+    assert await buffer._flush([contact(1)])
+    assert contacts.calls == 1
+    assert contacts.documents == {}
+    assert await counted(db) == 0
+
+
+async def test_stop_gives_up_after_stopping_attempts(db, use_contacts, buffer, caplog):
+    contacts = use_contacts(FakeContacts(*[AutoReconnect("connection refused")] * 100))
+    # A long backoff while running, cut short by stop()
+    buffer.RETRY_BACKOFF = 10
+    buffer.flush_interval = 0
+    buffer.start()
+    assert buffer.enqueue(contact(1))
+    await asyncio.sleep(0.01)
+    assert contacts.calls == 1
+    buffer.RETRY_BACKOFF = 0.01
+    assert buffer.enqueue(contact(2))
+
+    await asyncio.wait_for(buffer.stop(), 1)
+
+    assert contacts.calls == 1 + buffer.STOPPING_ATTEMPTS
+    assert not buffer.running
+    assert await counted(db) == 0
+    assert "lost" in caplog.text and "c1" in caplog.text and "c2" in caplog.text
+
+
+async def test_stop_flushes_queued_contacts(db, use_contacts, buffer):
+    contacts = use_contacts(FakeContacts())
+    buffer.flush_interval = 10
+    buffer.start()
+    for index in range(3):
+        assert buffer.enqueue(contact(index))
+    await buffer.stop()
+    assert set(contacts.documents) == {"c0", "c1", "c2"}
+    assert await counted(db) == 3
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def contacts(db):
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    documents = []
+    for index in range(23):
+        documents.append({
+            "id": f"contact-{index:02d}",
+            "name": f"Cliente {index}",
+            "phone": "11999990000",
+            "message": "Orçamento",
+            "status": "new" if index % 3 else "contacted",
+            # Groups of three share a timestamp, so pages break inside ties
+            "created_at": start + timedelta(minutes=index // 3),
+        })
+    await db.contacts.insert_many([dict(document) for document in documents])
+    await server.reconcile_contact_counters()
+    return documents
+
+
+def newest_first(documents):
+    return sorted(documents, key=lambda document: (document["created_at"], document["id"]), reverse=True)
+
+
+async def get_page(limit, cursor=None, status_filter=None, q=None):
+    return await server.admin_get_contacts(
+        limit=limit, cursor=cursor, status_filter=status_filter, q=q, since=None, current_user="admin"
+    )
+
+
+async def follow(limit, **filters):
+    pages = [await get_page(limit, **filters)]
+    while pages[-1]["next_cursor"]:
+        pages.append(await get_page(limit, cursor=pages[-1]["next_cursor"], **filters))
+    return pages
+
+
+async def test_cursor_round_trip_returns_every_contact_once(contacts):
+    pages = await follow(5)
+    ids = [contact["id"] for page in pages for contact in page["contacts"]]
+    assert ids == [document["id"] for document in newest_first(contacts)]
+    assert len(pages) == 5
+    assert pages[-1]["next_cursor"] is None
+
+
+async def test_total_only_on_first_page(contacts):
+    pages = await follow(10)
+    assert pages[0]["total"] == len(contacts)
+    assert all(page["total"] is None for page in pages[1:])
+
+
+async def test_status_filter_pages_and_counts_from_counters(contacts):
+    expected = [document for document in contacts if document["status"] == "contacted"]
+    pages = await follow(3, status_filter="contacted")
+    ids = [contact["id"] for page in pages for contact in page["contacts"]]
+    assert ids == [document["id"] for document in newest_first(expected)]
+    assert pages[0]["total"] == len(expected)
+
+
+async def test_search_total_counts_matching_documents(contacts):
+    page = await get_page(50, q="cliente 1")
+    assert page["total"] == 11
+    assert {contact["id"] for contact in page["contacts"]} == {
+        document["id"] for document in contacts if document["name"].startswith("Cliente 1")
+    }
+
+
+async def test_invalid_cursor_is_400(contacts):
+    with pytest.raises(HTTPException) as raised:
+        await get_page(5, cursor="not-a-cursor")
+    assert raised.value.status_code == 400
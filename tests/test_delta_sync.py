@@ -0,0 +1,142 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from starlette.requests import Request
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def service(service_id, active=True):
+    return {"id": service_id, "title": service_id, "active": active, "updated_at": datetime.utcnow()}
+
+
+async def tick():
+    # Stored timestamps have millisecond precision
+    await asyncio.sleep(0.002)
+
+
+async def test_delete_after_recreate_is_reported_again(db):
+    await server.ensure_indexes()
+    await db.services.insert_one(service("s1"))
+    await server.admin_delete_service("s1", current_user="admin")
+    await tick()
+    since = datetime.utcnow()
+    await tick()
+    # Seeded again into the emptied collection, then deleted again
+    await db.services.insert_one(service("s1"))
+    await server.admin_delete_service("s1", current_user="admin")
+
+    delta = await server.delta_changes("services", since)
+    assert delta["deleted"] == ["s1"]
+    assert await db.tombstones.count_documents({"collection": "services", "id": "s1"}) == 1
+
+
+async def test_racing_deletes_keep_one_tombstone(db):
+    await server.ensure_indexes()
+    await asyncio.gather(*(server.record_tombstones("services", ["s1"]) for _ in range(5)))
+    assert await db.tombstones.count_documents({"collection": "services", "id": "s1"}) == 1
+
+
+async def test_changed_since_and_server_time_overlap(db):
+    await db.services.insert_one(service("s1"))
+    before = datetime.utcnow()
+    delta = await server.delta_changes("services", before - timedelta(minutes=1))
+    assert [document["id"] for document in delta["changed"]] == ["s1"]
+    assert delta["resync"] is False
+    # server_time trails the clock, so a write landing during the sync is
+    # read again by the next one
+    overlap = timedelta(seconds=server.DELTA_SYNC_OVERLAP_SECONDS)
+    assert before - overlap <= delta["server_time"] <= datetime.utcnow() - overlap
+    again = await server.delta_changes("services", delta["server_time"])
+    assert [document["id"] for document in again["changed"]] == ["s1"]
+
+
+async def test_unchanged_records_are_left_out(db):
+    await db.services.insert_one(service("s1"))
+    await tick()
+    since = datetime.utcnow()
+    await tick()
+    await db.services.insert_one(service("s2"))
+    delta = await server.delta_changes("services", since)
+    assert [document["id"] for document in delta["changed"]] == ["s2"]
+    assert delta["deleted"] == []
+
+
+async def test_aware_since_is_compared_as_utc(db):
+    await tick()
+    since = datetime.now(timezone(timedelta(hours=-3)))
+    await tick()
+    await db.services.insert_one(service("s1"))
+    delta = await server.delta_changes("services", since)
+    assert [document["id"] for document in delta["changed"]] == ["s1"]
+
+
+async def test_active_only_reports_deactivated_records_as_deleted(db):
+    since = datetime.utcnow() - timedelta(minutes=1)
+    await db.services.insert_many([service("s1"), service("s2", active=False)])
+
+    public = await server.delta_changes("services", since, active_only=True)
+    assert [document["id"] for document in public["changed"]] == ["s1"]
+    assert public["deleted"] == ["s2"]
+
+    admin = await server.delta_changes("services", since)
+    assert sorted(document["id"] for document in admin["changed"]) == ["s1", "s2"]
+    assert admin["deleted"] == []
+
+
+async def test_since_past_retention_asks_for_resync(db):
+    await db.services.insert_one(service("s1"))
+    since = datetime.utcnow() - timedelta(days=server.TOMBSTONE_RETENTION_DAYS, minutes=1)
+    delta = await server.delta_changes("services", since)
+    assert delta == {"changed": [], "deleted": [], "resync": True, "server_time": delta["server_time"]}
+
+
+async def test_id_seeded_again_after_delete_is_changed_not_deleted(db):
+    since = datetime.utcnow() - timedelta(minutes=1)
+    await db.services.insert_one(service("s1"))
+    await server.admin_delete_service("s1", current_user="admin")
+    await tick()
+    await db.services.insert_one(service("s1"))
+    delta = await server.delta_changes("services", since)
+    assert [document["id"] for document in delta["changed"]] == ["s1"]
+    assert delta["deleted"] == []
+
+
+async def test_public_route_delta(db):
+    since = datetime.utcnow() - timedelta(minutes=1)
+    await db.services.insert_many([service("s1"), service("s2", active=False)])
+    response = await server.get_services(Request({"type": "http", "method": "GET", "headers": []}), since=since)
+    body = json.loads(response.body)
+    assert [document["id"] for document in body["services"]] == ["s1"]
+    assert body["deleted"] == ["s2"]
+
+
+async def test_contacts_delta_with_status_and_search(db):
+    since = datetime.utcnow() - timedelta(minutes=1)
+    now = datetime.utcnow()
+    await db.contacts.insert_many([
+        {"id": "c1", "name": "Ana", "status": "pending", "created_at": now, "updated_at": now},
+        {"id": "c2", "name": "Bruno", "status": "contacted", "created_at": now, "updated_at": now},
+        {"id": "c3", "name": "Ana Paula", "status": "contacted", "created_at": now, "updated_at": now},
+        {"id": "c4", "name": "Carla", "status": "contacted", "created_at": now, "updated_at": now},
+    ])
+    await server.reconcile_contact_counters()
+    await server.admin_delete_contact("c4", current_user="admin")
+
+    async def delta(**filters):
+        filters = {"status_filter": None, "q": None, **filters}
+        return await server.admin_get_contacts(limit=50, cursor=None, since=since, current_user="admin", **filters)
+
+    by_status = await delta(status_filter="contacted")
+    assert sorted(contact["id"] for contact in by_status["contacts"]) == ["c2", "c3"]
+    by_search = await delta(q="ana")
+    assert sorted(contact["id"] for contact in by_search["contacts"]) == ["c1", "c3"]
+    both = await delta(status_filter="contacted", q="ana")
+    assert [contact["id"] for contact in both["contacts"]] == ["c3"]
+    # Deletions are reported whatever the filter
+    assert by_status["deleted"] == by_search["deleted"] == both["deleted"] == ["c4"]
+    assert set(both) == {"contacts", "deleted", "resync", "server_time"}
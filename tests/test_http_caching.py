@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+async def services(db):
+    await db.services.insert_one({"id": "1", "title": "Sofás", "active": True, "updated_at": datetime.utcnow()})
+
+
+async def test_public_get_sends_etag_and_cache_control(api, services):
+    response = await api.get("/api/services", headers=IDENTITY)
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "max-age=" in response.headers["cache-control"]
+
+
+async def test_matching_if_none_match_is_304(api, services):
+    etag = (await api.get("/api/services", headers=IDENTITY)).headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = await api.get("/api/services", headers={**IDENTITY, "If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+async def test_stale_if_none_match_gets_the_new_body(api, db, services):
+    etag = (await api.get("/api/services", headers=IDENTITY)).headers["etag"]
+    await db.services.update_one({"id": "1"}, {"$set": {"title": "Colchões"}})
+    await server.catalog_changed("services")
+    response = await api.get("/api/services", headers={**IDENTITY, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["services"][0]["title"] == "Colchões"
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('"abcd"', False),
+    ("*", True),
+])
+def test_etag_matches(if_none_match, expected):
+    assert server.etag_matches(if_none_match, '"abc"') is expected
+
+
+def test_variant_etag():
+    assert server.variant_etag('"abc"', None) == '"abc"'
+    assert server.variant_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert server.variant_etag('W/"abc"', "br") == 'W/"abc"'
@@ -0,0 +1,39 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_indexes_are_created_once_without_drift(db):
+    assert await server.ensure_indexes() == []
+    assert await server.ensure_indexes() == []
+    information = await db.contact_counters.index_information()
+    assert information["day"].get("sparse") is True
+
+
+async def test_index_defined_differently_is_drift(db):
+    await db.contact_counters.create_index([("day", ASCENDING)], name="day")
+    await db.services.create_index([("legacy", ASCENDING)], name="legacy")
+    assert sorted(await server.ensure_indexes()) == [
+        "contact_counters.day: definition differs from registry",
+        "services.legacy: not declared in registry",
+    ]
+
+
+@pytest.mark.parametrize("existing", [
+    IndexModel([("day", ASCENDING)], name="day"),
+    IndexModel([("day", ASCENDING)], name="day", sparse=True, unique=True),
+    IndexModel([("day", -1)], name="day", sparse=True),
+    IndexModel([("day", ASCENDING)], name="day", partialFilterExpression={"day": {"$exists": True}}),
+])
+def test_signature_tells_definitions_apart(existing):
+    declared = server.INDEXES["contact_counters"][0].document
+    assert server._index_signature(existing.document) != server._index_signature(declared)
+
+
+def test_signature_ignores_key_container_type():
+    declared = server.INDEXES["contact_counters"][0].document
+    existing = {"key": [("day", 1.0)], "sparse": True, "v": 2}
+    assert server._index_signature(existing) == server._index_signature(declared)
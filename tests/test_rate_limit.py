@@ -0,0 +1,123 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def make_request(forwarded_for=None, peer="10.0.0.1"):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "method": "POST", "headers": headers, "client": (peer, 50000)})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = server.InMemoryRateLimitBackend()
+    monkeypatch.setattr(server, "rate_limit_backend", backend)
+    return backend
+
+
+@pytest.mark.parametrize("hops, forwarded_for, expected", [
+    # Behind one proxy: the entry it appended, whatever the client sent before it
+    (1, "203.0.113.7", "203.0.113.7"),
+    (1, "1.2.3.4, 203.0.113.7", "203.0.113.7"),
+    # Behind a CDN and a load balancer: the entry the CDN appended
+    (2, "1.2.3.4, 203.0.113.7, 198.51.100.2", "203.0.113.7"),
+    # Fewer entries than trusted proxies: not from behind them
+    (2, "203.0.113.7", "10.0.0.1"),
+    (1, " ", "10.0.0.1"),
+    (1, None, "10.0.0.1"),
+])
+def test_client_ip_takes_the_trusted_hop(monkeypatch, hops, forwarded_for, expected):
+    monkeypatch.setattr(server, "TRUSTED_PROXY_HOPS", hops)
+    assert server.client_ip(make_request(forwarded_for)) == expected
+
+
+def test_forged_forwarded_for_is_ignored_without_trusted_proxies(monkeypatch, caplog):
+    monkeypatch.setattr(server, "TRUSTED_PROXY_HOPS", 0)
+    monkeypatch.setattr(server, "_untrusted_forwarded_for_warned", False)
+    assert server.client_ip(make_request("1.2.3.4")) == "10.0.0.1"
+    assert server.client_ip(make_request("5.6.7.8")) == "10.0.0.1"
+    assert caplog.text.count("TRUSTED_PROXY_HOPS is 0") == 1
+
+
+async def test_bucket_allows_a_burst_then_refills(backend, clock):
+    for _ in range(5):
+        assert await backend.acquire("contact:ip:a", capacity=5, rate=1 / 6) == 0
+    assert await backend.acquire("contact:ip:a", capacity=5, rate=1 / 6) == pytest.approx(6)
+    # Refused requests do not take tokens
+    clock.now += 3
+    assert await backend.acquire("contact:ip:a", capacity=5, rate=1 / 6) == pytest.approx(3)
+    clock.now += 3
+    assert await backend.acquire("contact:ip:a", capacity=5, rate=1 / 6) == 0
+
+
+async def test_buckets_are_per_key(backend, clock):
+    assert await backend.acquire("contact:ip:a", capacity=1, rate=1) == 0
+    assert await backend.acquire("contact:ip:a", capacity=1, rate=1) > 0
+    assert await backend.acquire("contact:ip:b", capacity=1, rate=1) == 0
+
+
+async def test_idlest_keys_are_evicted(clock):
+    backend = server.InMemoryRateLimitBackend(max_keys=10)
+    for index in range(10):
+        clock.now += 1
+        await backend.acquire(f"key{index}", capacity=5, rate=1)
+    clock.now += 1
+    await backend.acquire("key0", capacity=5, rate=1)
+    await backend.acquire("key10", capacity=5, rate=1)
+    assert len(backend._buckets) == 9
+    assert "key0" in backend._buckets and "key10" in backend._buckets
+    assert "key1" not in backend._buckets and "key2" not in backend._buckets
+
+
+async def test_exceeded_limit_is_429_with_retry_after(backend, clock):
+    capacity = server.RATE_LIMITS["contact"]["capacity"]
+    for _ in range(capacity):
+        await server.enforce_rate_limit("contact", ["ip:a", "phone:1"])
+    with pytest.raises(HTTPException) as raised:
+        await server.enforce_rate_limit("contact", ["ip:a", "phone:1"])
+    assert raised.value.status_code == 429
+    wait = 60 / server.RATE_LIMITS["contact"]["per_minute"]
+    assert wait <= int(raised.value.headers["Retry-After"]) <= wait + 1
+
+
+async def test_any_exhausted_key_refuses(backend, clock):
+    capacity = server.RATE_LIMITS["contact"]["capacity"]
+    for index in range(capacity):
+        await server.enforce_rate_limit("contact", [f"ip:{index}", "phone:1"])
+    # A new IP, but the same phone number
+    with pytest.raises(HTTPException):
+        await server.enforce_rate_limit("contact", ["ip:new", "phone:1"])
+
+
+@pytest.mark.parametrize("phone, keys", [
+    ("(11) 99999-0000", ["ip:10.0.0.1", "phone:11999990000"]),
+    ("sem telefone", ["ip:10.0.0.1"]),
+])
+async def test_contact_is_limited_per_ip_and_phone_digits(db, monkeypatch, phone, keys):
+    limited = []
+
+    async def enforce_rate_limit(route, route_keys):
+        limited.append((route, route_keys))
+    monkeypatch.setattr(server, "enforce_rate_limit", enforce_rate_limit)
+    contact = server.ContactCreate(name="Cliente", phone=phone, message="Orçamento")
+    await server.create_contact(contact, make_request())
+    assert limited == [("contact", keys)]
@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def token_cache(monkeypatch):
+    cache = server.TokenCache(100)
+    monkeypatch.setattr(server, "token_cache", cache)
+    return cache
+
+
+def new_token():
+    return server.create_access_token({"sub": "admin"}, timedelta(minutes=5))
+
+
+def assert_rejected(token):
+    with pytest.raises(HTTPException) as raised:
+        server.validate_token(token)
+    assert raised.value.status_code == 401
+
+
+def other_worker(monkeypatch):
+    # A worker with its own cache, synced from the database
+    monkeypatch.setattr(server, "token_cache", server.TokenCache(100))
+    return server.TokenRevocationSync(poll_interval=1)
+
+
+def test_verified_token_is_cached(monkeypatch):
+    token = new_token()
+    assert server.validate_token(token) == "admin"
+
+    def decode(*args, **kwargs):
+        raise AssertionError("cached token decoded again")
+    monkeypatch.setattr(server.jwt, "decode", decode)
+    assert server.validate_token(token) == "admin"
+
+
+def test_cache_evicts_least_recently_used(token_cache):
+    token_cache.max_size = 2
+    first, second, third = new_token(), new_token(), new_token()
+    server.validate_token(first)
+    server.validate_token(second)
+    server.validate_token(first)
+    server.validate_token(third)
+    assert token_cache.get(server.token_digest(first)) == "admin"
+    assert token_cache.get(server.token_digest(second)) is None
+
+
+def test_invalid_and_scoped_tokens_are_rejected():
+    assert_rejected("not-a-token")
+    ticket = server.create_stream_ticket(server.token_session(new_token()))
+    assert_rejected(ticket)
+
+
+async def test_revoked_token_is_rejected_others_still_valid(db):
+    token, other = new_token(), new_token()
+    server.validate_token(token)
+    await server.revoke_token(token)
+    assert_rejected(token)
+    assert server.validate_token(other) == "admin"
+    assert await db.token_revocations.count_documents({"_id": server.token_digest(token)}) == 1
+
+
+async def test_revoke_all_rejects_earlier_tokens(db):
+    token = new_token()
+    server.validate_token(token)
+    await server.revoke_all_tokens()
+    assert_rejected(token)
+
+
+def test_revoke_all_rejects_tokens_issued_in_the_same_second(token_cache):
+    token = new_token()
+    server.validate_token(token)
+    # Logout-all later in the second the token was issued in
+    token_cache.revoke_all(server.token_session(token)["iat"])
+    assert_rejected(token)
+
+
+def test_revoke_all_accepts_tokens_issued_after(token_cache):
+    token = new_token()
+    token_cache.revoke_all(server.token_session(token)["iat"] - 1)
+    assert server.validate_token(token) == "admin"
+    token_cache.revoke_all(server.token_session(token)["iat"] - 2)
+    # valid_after never moves back
+    assert token_cache.valid_after == server.token_session(token)["iat"] - 1
+
+
+async def test_revoke_all_keeps_single_revocations(db):
+    token = new_token()
+    await server.revoke_token(token)
+    server.token_cache.revoke_all(0)
+    assert_rejected(token)
+
+
+async def test_sync_applies_revocations_from_other_workers(db, monkeypatch):
+    revoked, kept = new_token(), new_token()
+    await server.revoke_token(revoked)
+
+    sync = other_worker(monkeypatch)
+    assert server.validate_token(revoked) == "admin"
+    await sync.refresh()
+    assert_rejected(revoked)
+    assert server.validate_token(kept) == "admin"
+
+
+async def test_sync_picks_up_revocations_after_the_first_read(db, monkeypatch):
+    first, second = new_token(), new_token()
+    await server.revoke_token(first)
+    sync = other_worker(monkeypatch)
+    await sync.refresh()
+    assert server.validate_token(second) == "admin"
+
+    # Recorded by the first worker after this one's read
+    await db.token_revocations.update_one(
+        {"_id": server.token_digest(second)},
+        {"$set": {"expires_at": server.datetime.utcnow() + timedelta(minutes=5), "revoked_at": server.datetime.utcnow()}},
+        upsert=True
+    )
+    await sync.refresh()
+    assert_rejected(first)
+    assert_rejected(second)
+
+
+async def test_sync_applies_revoke_all(db, monkeypatch):
+    token = new_token()
+    await server.revoke_all_tokens()
+    sync = other_worker(monkeypatch)
+    await sync.refresh()
+    assert_rejected(token)